@@ -1,7 +1,6 @@
 # backend/agents/action_explainability_agent.py
 
 from typing import Dict, List
-from backend.utils.state_sanitizer import sanitize_state  # ✅ REQUIRED
 
 
 def _explain_customer(row: Dict, risk_state: Dict) -> List[str]:
@@ -93,13 +92,15 @@ def action_explainability_agent_node(state: Dict) -> Dict:
 
     # Defensive exit (graph-safe)
     if not customers or risk_state is None:
-        agent_outputs["action_explainability"] = {
-            "agent": "action_explainability",
-            "actions": [],
-            "confidence": 0,
+        return {
+            "agent_outputs": {
+                "action_explainability": {
+                    "agent": "action_explainability",
+                    "actions": [],
+                    "confidence": 0,
+                }
+            }
         }
-        state["agent_outputs"] = agent_outputs
-        return sanitize_state(state)
 
     # Determine primary driver (UNCHANGED LOGIC)
     if agent_outputs.get("cx", {}).get("severity") == "high":
@@ -133,7 +134,7 @@ def action_explainability_agent_node(state: Dict) -> Dict:
             }
         )
 
-    agent_outputs["action_explainability"] = {
+    output = {
         "agent": "action_explainability",
         "actions": action_plan,
         "confidence": round(
@@ -141,7 +142,5 @@ def action_explainability_agent_node(state: Dict) -> Dict:
         ),
     }
 
-    state["agent_outputs"] = agent_outputs
-
-    # 🔒 CRITICAL: prevent LangGraph key conflicts
-    return sanitize_state(state)
+    # 🔒 Partial update only: merged into agent_outputs by the state reducer
+    return {"agent_outputs": {"action_explainability": output}}
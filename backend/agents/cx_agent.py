@@ -40,7 +40,7 @@ def cx_agent_node(state):
         diagnosis = "Customer experience remains stable"
         confidence = 0.4
 
-    state["agent_outputs"]["cx"] = {
+    output = {
         "agent": "cx",
         "status": status,
         "severity": severity,
@@ -50,4 +50,5 @@ def cx_agent_node(state):
         "diagnosis": diagnosis,
     }
 
-    return state
+    # Partial update only: merged into agent_outputs by the state reducer
+    return {"agent_outputs": {"cx": output}}
@@ -27,8 +27,7 @@ def data_validation_agent_node(state):
             "confidence_adjustment": 0.5,
             "notes": "Insufficient data available for validation."
         })
-        state["agent_outputs"]["data_validation"] = validation_output
-        return state
+        return {"agent_outputs": {"data_validation": validation_output}}
 
     # Simple distribution sanity checks
     anomalies = []
@@ -50,5 +49,5 @@ def data_validation_agent_node(state):
             "notes": f"Potential distribution anomalies detected in: {anomalies}"
         })
 
-    state["agent_outputs"]["data_validation"] = validation_output
-    return state
+    # Partial update only: merged into agent_outputs by the state reducer
+    return {"agent_outputs": {"data_validation": validation_output}}
@@ -1,7 +1,6 @@
 # backend/agents/evaluation_agent.py
 
 from typing import Dict
-from backend.utils.state_sanitizer import sanitize_state  # ✅ REQUIRED
 
 
 def evaluation_agent_node(state: Dict) -> Dict:
@@ -81,7 +80,7 @@ def evaluation_agent_node(state: Dict) -> Dict:
     # ----------------------------
     # 6. Store output (SAFE)
     # ----------------------------
-    agent_outputs["evaluation"] = {
+    output = {
         "agent": "evaluation",
         "agreement_score": agreement_score,
         "agreement_level": agreement_level,
@@ -94,7 +93,5 @@ def evaluation_agent_node(state: Dict) -> Dict:
         },
     }
 
-    state["agent_outputs"] = agent_outputs
-
-    # 🔒 CRITICAL: prevent LangGraph concurrent key updates
-    return sanitize_state(state)
+    # 🔒 Partial update only: merged into agent_outputs by the state reducer
+    return {"agent_outputs": {"evaluation": output}}
@@ -2,7 +2,6 @@
 
 from typing import Dict
 from backend.memory.feedback_memory import save_feedback_memory
-from backend.utils.state_sanitizer import sanitize_state  # ✅ REQUIRED FIX
 
 
 def feedback_agent_node(state: Dict) -> Dict:
@@ -15,7 +14,6 @@ def feedback_agent_node(state: Dict) -> Dict:
     - Persists feedback memory (append-only)
     """
 
-    agent_outputs = state.get("agent_outputs", {})
     final_decision = state.get("final_decision")
 
     # Defensive snapshot (UNCHANGED LOGIC)
@@ -42,9 +40,5 @@ def feedback_agent_node(state: Dict) -> Dict:
     # 🔒 MEMORY PERSISTENCE (SIDE EFFECT ONLY — NO LOGIC CHANGE)
     save_feedback_memory(feedback_payload)
 
-    # Store in agent outputs
-    agent_outputs["feedback"] = feedback_payload
-    state["agent_outputs"] = agent_outputs
-
-    # 🔒 CRITICAL: prevent LangGraph concurrent update errors
-    return sanitize_state(state)
+    # 🔒 Partial update only: merged into agent_outputs by the state reducer
+    return {"agent_outputs": {"feedback": feedback_payload}}
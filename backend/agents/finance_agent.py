@@ -40,7 +40,7 @@ def finance_agent_node(state):
         diagnosis = "Financial metrics within normal range"
         confidence = 0.4
 
-    state["agent_outputs"]["finance"] = {
+    output = {
         "agent": "finance",
         "status": status,
         "severity": severity,
@@ -50,4 +50,5 @@ def finance_agent_node(state):
         "diagnosis": diagnosis,
     }
 
-    return state
+    # Partial update only: merged into agent_outputs by the state reducer
+    return {"agent_outputs": {"finance": output}}
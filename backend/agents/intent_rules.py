@@ -0,0 +1,199 @@
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, List
+
+_HERE = Path(__file__).resolve().parent
+
+INTENT_RULES_PATH = os.getenv("INTENT_RULES_PATH", str(_HERE / "intent_rules.json"))
+INTENT_FIXTURES_PATH = _HERE / "intent_rules_fixtures.json"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(term: str) -> str:
+    return _WHITESPACE.sub(" ", term.strip().lower())
+
+
+def _trie_pattern(terms: List[str]) -> str:
+    """
+    One regex for all terms, factored by common prefix so matching
+    cost tracks the text length rather than the vocabulary size.
+    Spaces inside phrases match any run of whitespace.
+    """
+
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [
+            (r"\s+" if ch == " " else re.escape(ch)) + build(child)
+            for ch, child in sorted(node.items())
+            if ch != ""
+        ]
+        if not branches:
+            return ""
+
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Terminal node: the longer continuation is optional (tried first)
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class IntentRuleEngine:
+    """
+    Intent Rule Engine
+    ------------------
+    Keyword / phrase rules from config, compiled once into a single
+    word-boundary regex.
+
+    - One pass over the query resolves every field (intent, entity,
+      time horizon, ...); "now" no longer matches inside "know"
+    - Per field, the first matching rule in config order wins
+      (same precedence as the original if / elif chains)
+    - A rule may also set other fields, e.g. today → urgency high
+    - Overlapping terms resolve to the longest match at a position
+    """
+
+    def __init__(self, config: Dict):
+        self.version = config.get("version")
+        self.fields = config["fields"]
+        self.defaults = {name: spec.get("default") for name, spec in self.fields.items()}
+
+        # term → [(field, priority, label, extra fields)]
+        self._terms: Dict[str, List[tuple]] = {}
+        for field, spec in self.fields.items():
+            for priority, rule in enumerate(spec.get("rules", [])):
+                for term in rule["terms"]:
+                    self._terms.setdefault(_normalize(term), []).append(
+                        (field, priority, rule["label"], rule.get("set", {}))
+                    )
+
+        pattern = _trie_pattern(sorted(self._terms)) if self._terms else "(?!x)x"
+        self._regex = re.compile(rf"\b{pattern}\b", re.IGNORECASE)
+
+    @classmethod
+    def from_file(cls, path: str = INTENT_RULES_PATH) -> "IntentRuleEngine":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def parse(self, text: str) -> Dict:
+        best: Dict[str, tuple] = {}
+
+        for match in self._regex.finditer(text):
+            for field, priority, label, extra in self._terms.get(_normalize(match.group(0)), ()):
+                if field not in best or priority < best[field][0]:
+                    best[field] = (priority, label, extra)
+
+        result = dict(self.defaults)
+        for field, (_, label, _) in best.items():
+            result[field] = label
+
+        # Side effects applied after all fields are resolved
+        for field, (_, _, extra) in best.items():
+            result.update(extra)
+
+        return result
+
+    def stats(self) -> Dict:
+        return {
+            "version": self.version,
+            "fields": list(self.fields),
+            "terms": len(self._terms),
+            "pattern_chars": len(self._regex.pattern),
+        }
+
+
+# Process-wide engine used by the query understanding agent
+INTENT_ENGINE = IntentRuleEngine.from_file()
+
+
+# --------------------------------------------------
+# Accuracy & Benchmark
+# --------------------------------------------------
+def check_fixtures(engine: IntentRuleEngine = INTENT_ENGINE, path: Path = INTENT_FIXTURES_PATH) -> Dict:
+    """
+    Runs the labelled queries in the fixture file; only the fields a
+    fixture lists are compared.
+    """
+
+    with open(path, "r", encoding="utf-8") as f:
+        fixtures = json.load(f)
+
+    failures = []
+    for fixture in fixtures:
+        parsed = engine.parse(fixture["query"])
+        wrong = {
+            field: {"expected": expected, "got": parsed.get(field)}
+            for field, expected in fixture.items()
+            if field != "query" and parsed.get(field) != expected
+        }
+        if wrong:
+            failures.append({"query": fixture["query"], "fields": wrong})
+
+    return {
+        "fixtures": len(fixtures),
+        "passed": len(fixtures) - len(failures),
+        "failures": failures,
+    }
+
+
+def _substring_parse(query: str, config: Dict) -> Dict:
+    # The original approach: one any(word in query) scan per rule
+    query = query.lower()
+    result = {name: spec.get("default") for name, spec in config["fields"].items()}
+    for field, spec in config["fields"].items():
+        for rule in spec.get("rules", []):
+            if any(term in query for term in rule["terms"]):
+                result[field] = rule["label"]
+                result.update(rule.get("set", {}))
+                break
+    return result
+
+
+def benchmark(vocabulary: int = 500, repeats: int = 2000) -> Dict:
+    """
+    Per-query parse time, substring scans vs the compiled engine, with
+    the shipped rules and with the vocabulary padded to `vocabulary`
+    extra terms.
+    """
+
+    with open(INTENT_RULES_PATH, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    with open(INTENT_FIXTURES_PATH, "r", encoding="utf-8") as f:
+        queries = [fixture["query"] for fixture in json.load(f)]
+
+    padded = json.loads(json.dumps(config))
+    padded["fields"]["entity"]["rules"].append({
+        "label": "synthetic",
+        "terms": [f"term{i}x{i % 7}" for i in range(vocabulary)],
+    })
+
+    def per_query_us(fn):
+        started = time.perf_counter()
+        for _ in range(repeats):
+            for query in queries:
+                fn(query)
+        return round((time.perf_counter() - started) / (repeats * len(queries)) * 1e6, 2)
+
+    results = {}
+    for name, cfg in (("shipped", config), (f"padded_{vocabulary}", padded)):
+        engine = IntentRuleEngine(cfg)
+        results[name] = {
+            "terms": engine.stats()["terms"],
+            "substring_us": per_query_us(lambda q: _substring_parse(q, cfg)),
+            "compiled_us": per_query_us(engine.parse),
+        }
+
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps({"accuracy": check_fixtures(), "benchmark": benchmark()}, indent=2))
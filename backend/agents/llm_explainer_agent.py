@@ -1,11 +1,43 @@
-from typing import Dict
-from groq import Groq
-import os
-import json
+from typing import Dict, List
+
+from backend.llm.gateway import LLM_GATEWAY, LLMUnavailableError
+from backend.llm.response_cache import LLM_RESPONSE_CACHE, cache_key
+from backend.llm.prompt_builder import build_explainer_prompt
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 MODEL_NAME = "llama-3.3-70b-versatile"
+TEMPERATURE = 0.2
+MAX_TOKENS = 600
+SYSTEM_PROMPT = "Generate explanations only."
+
+
+def _fallback_summary(top_customers: List[Dict], final_decision: Dict) -> str:
+    """
+    Deterministic summary used when the LLM provider is unavailable.
+    Built only from the decision and scores, so it never invents data.
+    """
+
+    status = str(final_decision.get("overall_status", "unknown")).upper()
+    drivers = final_decision.get("primary_driver") or []
+    drivers = drivers if isinstance(drivers, list) else [drivers]
+
+    leaders = ", ".join(
+        f"{c.get('customer_id')} (risk score {float(c.get('customer_risk_score', 0)):.2f})"
+        for c in top_customers[:3]
+    )
+
+    parts = [
+        f"Overall status is {status} "
+        f"(confidence {final_decision.get('confidence', 0)}).",
+        final_decision.get("summary", ""),
+    ]
+    if drivers:
+        parts.append(f"Primary risk drivers: {', '.join(drivers)}.")
+    if leaders:
+        parts.append(
+            f"{len(top_customers)} customers are prioritized; highest risk: {leaders}."
+        )
 
+    return " ".join(p for p in parts if p)
 
 
 def llm_explainer_agent_node(state: Dict) -> Dict:
@@ -14,57 +46,80 @@ def llm_explainer_agent_node(state: Dict) -> Dict:
     --------------------------------
     - Generates executive explanation
     - NEVER changes decision logic
+    - Answers are cached by a hash of model, prompts and inputs
+      (set state["bypass_llm_cache"] to force a fresh call)
+    - Calls go through the LLM gateway; when it gives up (deadline,
+      retries exhausted, circuit open) a deterministic summary is used
     """
 
-    agent_outputs = state.get("agent_outputs", {})
     top_customers = state.get("top_customers", [])
     final_decision = state.get("final_decision", {})
 
     if not top_customers or not final_decision:
-        return state
-
-    prompt = f"""
-You are an enterprise risk analyst.
-
-Explain in simple language:
-- Why these customers need attention
-- Provide a short executive summary
-
-Do NOT invent data.
-Do NOT suggest actions.
-
-Top Customers:
-{json.dumps(top_customers, indent=2)}
-
-Final Decision:
-{json.dumps(final_decision, indent=2)}
-"""
-
-    try:
-        response = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "Generate explanations only."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2,
-            max_tokens=600,
-        )
-
-        explanation = response.choices[0].message.content.strip()
-
-    except Exception as e:
-        explanation = f"LLM explanation unavailable: {str(e)}"
-
-    # ✅ WRITE TO TOP-LEVEL STATE (REQUIRED)
-    state["llm_explainer"] = {
+        return {}
+
+    # Compact, token-budgeted prompt (projected fields, CSV rows)
+    built = build_explainer_prompt(top_customers, final_decision)
+
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": built["prompt"]}
+    ]
+
+    key = cache_key(
+        MODEL_NAME,
+        TEMPERATURE,
+        messages,
+        payload={"customers": built["customers"], "decision": built["decision"]},
+        max_tokens=MAX_TOKENS,
+    )
+
+    bypass_cache = bool(state.get("bypass_llm_cache"))
+    explanation = None
+
+    if bypass_cache:
+        LLM_RESPONSE_CACHE.record_bypass()
+    else:
+        explanation = LLM_RESPONSE_CACHE.get(key)
+
+    cached = explanation is not None
+    source = "cache" if cached else "llm"
+    fallback_reason = None
+
+    if not cached:
+        try:
+            explanation = LLM_GATEWAY.complete(
+                messages,
+                model=MODEL_NAME,
+                temperature=TEMPERATURE,
+                max_tokens=MAX_TOKENS,
+            )
+
+            # Only real answers are cached, never fallbacks
+            LLM_RESPONSE_CACHE.set(key, explanation)
+
+        except LLMUnavailableError as e:
+            explanation = _fallback_summary(top_customers, final_decision)
+            source = "fallback"
+            fallback_reason = str(e)
+
+    llm_output = {
         "agent": "llm_explainer",
         "executive_summary": explanation,
-        "confidence": 0.75,
+        "confidence": 0.75 if source != "fallback" else 0.5,
+        "cached": cached,
+        "source": source,
+        "prompt_tokens": built["prompt_tokens"],
+        "prompt_token_budget": built["token_budget"],
+        "customers_in_prompt": built["customers_in_prompt"],
     }
 
-    # ✅ MIRROR INTO agent_outputs (FOR UI)
-    agent_outputs["llm_explainer"] = state["llm_explainer"]
-    state["agent_outputs"] = agent_outputs
+    if fallback_reason:
+        llm_output["fallback_reason"] = fallback_reason
 
-    return state
+    return {
+        # ✅ WRITE TO TOP-LEVEL STATE (REQUIRED)
+        "llm_explainer": llm_output,
+        # ✅ MIRROR INTO agent_outputs (FOR UI)
+        "agent_outputs": {"llm_explainer": llm_output},
+    }
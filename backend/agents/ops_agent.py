@@ -40,7 +40,7 @@ def ops_agent_node(state):
         diagnosis = "Operational metrics within normal range"
         confidence = 0.4
 
-    state["agent_outputs"]["operations"] = {
+    output = {
         "agent": "operations",
         "status": status,
         "severity": severity,
@@ -50,4 +50,5 @@ def ops_agent_node(state):
         "diagnosis": diagnosis,
     }
 
-    return state
+    # Partial update only: merged into agent_outputs by the state reducer
+    return {"agent_outputs": {"operations": output}}
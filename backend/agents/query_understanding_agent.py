@@ -1,3 +1,6 @@
+from backend.agents.intent_rules import INTENT_ENGINE
+
+
 def query_understanding_agent(state):
     """
     Query Understanding Agent
@@ -5,7 +8,7 @@ def query_understanding_agent(state):
     Purpose:
     - Parse the user's natural language query
     - Extract intent, entity, urgency, and time horizon
-    - Update shared state for downstream agents
+    - Update shared state for downstream agents (drives graph routing)
 
     This agent:
     - Does NOT access data
@@ -13,41 +16,13 @@ def query_understanding_agent(state):
     - Is deterministic and explainable
     """
 
-    query = state["query"].lower()
-
-    intent = "unknown"
-    entity = "general"
-    urgency = "normal"
-    time_horizon = "unspecified"
-
-    # ---- Intent detection ----
-    if any(word in query for word in ["why", "reason", "cause"]):
-        intent = "explanation"
-    elif any(word in query for word in ["who", "which", "list"]):
-        intent = "prioritization"
-    elif any(word in query for word in ["what should", "what action", "next step"]):
-        intent = "recommendation"
+    # One pass of the compiled rules (intent_rules.json)
+    parsed = INTENT_ENGINE.parse(state["query"])
 
-    # ---- Entity detection ----
-    if any(word in query for word in ["customer", "user", "account"]):
-        entity = "customer"
-    elif any(word in query for word in ["region", "city", "location"]):
-        entity = "region"
-
-    # ---- Time horizon & urgency ----
-    if any(word in query for word in ["today", "now", "immediately"]):
-        time_horizon = "today"
-        urgency = "high"
-    elif "week" in query:
-        time_horizon = "this_week"
-
-    # Update global state
-    state["intent"] = {
-        "intent": intent,
-        "entity": entity,
-        "time_horizon": time_horizon,
-        "urgency": urgency,
-        "raw_query": state["query"]
+    # Partial update: only the parsed intent
+    return {
+        "intent": {
+            **parsed,
+            "raw_query": state["query"]
+        }
     }
-
-    return state
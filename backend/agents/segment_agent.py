@@ -0,0 +1,57 @@
+from backend.intelligence.segmentation import SEGMENT_ENGINE
+from backend.agents.synthesis_agent import synthesis_agent_node
+
+# Segments listed in the agent output
+SEGMENT_SUMMARY_LIMIT = 10
+
+
+def segment_agent_node(state):
+    """
+    Segment Agent
+    -------------
+    Answers "which region / city needs attention" from the segmented
+    analysis instead of the per-customer pipeline.
+
+    - Segments ranked by severities from their whole distribution
+      (over-representation above the global p75 / p90), then by lift
+    - Final decision = synthesis over the worst segment's severities
+    """
+
+    intent = state.get("intent") or {}
+    dimension = intent.get("segment_dimension") or "region"
+
+    report = SEGMENT_ENGINE.analyze(dimension)
+    segments = [
+        {k: v for k, v in s.items() if k != "risk_state"}
+        for s in report["segments"]
+    ]
+    flagged = [s["segment"] for s in segments if s["attention_required"]]
+
+    if segments:
+        worst = segments[0]
+        final_decision = synthesis_agent_node(
+            {"agent_outputs": {a: {"severity": s} for a, s in worst["severities"].items()}}
+        )["final_decision"]
+        final_decision["summary"] = (
+            f"{worst['segment']} needs the most attention "
+            f"({len(flagged)} of {len(segments)} {dimension} segments flagged). "
+            + final_decision["summary"]
+        )
+    else:
+        final_decision = synthesis_agent_node({"agent_outputs": {}})["final_decision"]
+
+    final_decision["segment_dimension"] = dimension
+    final_decision["segments_needing_attention"] = flagged
+
+    output = {
+        "agent": "segment_analysis",
+        "dimension": dimension,
+        "segment_count": len(segments),
+        "segments": segments[:SEGMENT_SUMMARY_LIMIT],
+    }
+
+    return {
+        "agent_outputs": {"segment_analysis": output},
+        "final_decision": final_decision,
+        "risk_state": report["global_risk_state"],
+    }
@@ -1,76 +1,101 @@
+import os
+
+import numpy as np
 import pandas as pd
 
+from backend.intelligence.prioritization import top_k_positions
 
-def strategy_agent_node(state):
-    """
-    Strategy Agent:
-    - Identifies WHO needs attention
-    - Ranks customers by risk proximity
-    - Produces Ops-ready prioritization
-    """
+# How many customers land in final_decision["top_customers_today"]
+STRATEGY_TOP_N = int(os.getenv("STRATEGY_TOP_N", "5"))
 
-    features_df = state.get("features_df")
-    risk_state = state.get("risk_state")
-    agent_outputs = state.get("agent_outputs", {})
+# Column order of the proximity matrix (argmax index -> driver)
+DRIVERS = ["operations", "finance", "cx"]
+DRIVER_COLUMNS = ["ops_stress", "financial_stress", "cx_stress"]
+DRIVER_WEIGHTS = [0.45, 0.35, 0.20]
 
-    # If no customer-level data, fallback gracefully
-    if features_df is None or not isinstance(features_df, pd.DataFrame):
-        state["final_decision"]["prioritization"] = []
-        return state
+# Cap values for stability
+PROXIMITY_CAP = 1.5
 
-    df = features_df.copy()
 
-    # --- Thresholds from population risk ---
-    ops_threshold = risk_state["ops_stress"]["p90"]
-    fin_threshold = risk_state["financial_stress"]["p90"]
-    cx_threshold = risk_state["cx_stress"]["p90"]
+def compute_strategy(features_df: pd.DataFrame, risk_state: dict, top_n: int = STRATEGY_TOP_N) -> dict:
+    """
+    Risk proximity ranking
+    ----------------------
+    One (n, 3) proximity matrix against the p90 thresholds; the primary
+    driver is its row-wise argmax (first driver wins ties) and customers
+    are ranked with linear-time top-K selection.
+    """
 
-    # --- Risk proximity (continuous, early warning) ---
-    df["ops_proximity"] = df["ops_stress"] / ops_threshold
-    df["finance_proximity"] = df["financial_stress"] / fin_threshold
-    df["cx_proximity"] = df["cx_stress"] / cx_threshold
+    n = len(features_df)
+    thresholds = np.array([risk_state[col]["p90"] for col in DRIVER_COLUMNS], dtype=np.float64)
 
-    # Cap values for stability
-    df[["ops_proximity", "finance_proximity", "cx_proximity"]] = (
-        df[["ops_proximity", "finance_proximity", "cx_proximity"]]
-        .clip(upper=1.5)
-    )
+    # --- Risk proximity (continuous, early warning) ---
+    proximity = np.empty((n, len(DRIVER_COLUMNS)), dtype=np.float64)
+    for j, col in enumerate(DRIVER_COLUMNS):
+        np.divide(features_df[col].to_numpy(dtype=np.float64), thresholds[j], out=proximity[:, j])
+    np.minimum(proximity, PROXIMITY_CAP, out=proximity)
 
     # --- Priority score ---
-    df["priority_score"] = (
-        0.45 * df["ops_proximity"] +
-        0.35 * df["finance_proximity"] +
-        0.20 * df["cx_proximity"]
-    )
+    priority = np.zeros(n, dtype=np.float64)
+    for j, weight in enumerate(DRIVER_WEIGHTS):
+        priority += weight * proximity[:, j]
 
     # --- Primary driver ---
-    def driver(row):
-        scores = {
-            "operations": row["ops_proximity"],
-            "finance": row["finance_proximity"],
-            "cx": row["cx_proximity"]
+    driver_index = np.argmax(proximity, axis=1) if n else np.empty(0, dtype=np.int64)
+    counts = np.bincount(driver_index, minlength=len(DRIVERS))
+
+    # --- Select TOP customers ---
+    top = top_k_positions([priority], top_n)
+    rows = features_df.iloc[top]
+
+    top_customers = [
+        {
+            "customer_id": customer_id,
+            "priority_score": float(priority[pos]),
+            "primary_driver": DRIVERS[driver_index[pos]],
+            "ops_stress": float(ops),
+            "financial_stress": float(fin),
+            "cx_stress": float(cx),
         }
-        return max(scores, key=scores.get)
+        for pos, customer_id, ops, fin, cx in zip(
+            top,
+            rows["customer_id"],
+            rows["ops_stress"],
+            rows["financial_stress"],
+            rows["cx_stress"],
+        )
+    ]
 
-    df["primary_driver"] = df.apply(driver, axis=1)
+    return {
+        "top_customers_today": top_customers,
+        "driver_distribution": {d: int(c) for d, c in zip(DRIVERS, counts)},
+        "customers_ranked": n,
+        "prioritization_logic": "risk_proximity_ranking",
+    }
 
-    # --- Select TOP customers ---
-    top_customers = (
-        df.sort_values("priority_score", ascending=False)
-        .head(5)
-        .loc[:, [
-            "customer_id",
-            "priority_score",
-            "primary_driver",
-            "ops_stress",
-            "financial_stress",
-            "cx_stress"
-        ]]
-        .to_dict(orient="records")
-    )
+
+def strategy_agent_node(state, features_df: pd.DataFrame | None = None):
+    """
+    Strategy Agent:
+    - Identifies WHO needs attention
+    - Ranks customers by risk proximity
+    - Produces Ops-ready prioritization
+
+    Runs on the full feature set (passed in by the graph, since the state
+    never carries it) and extends the synthesized final decision.
+    """
+
+    if features_df is None:
+        features_df = state.get("features_df")
+    risk_state = state.get("risk_state")
+    final_decision = dict(state.get("final_decision") or {})
+
+    # If no customer-level data, fallback gracefully
+    if features_df is None or not isinstance(features_df, pd.DataFrame) or not risk_state:
+        final_decision["prioritization"] = []
+        return {"final_decision": final_decision}
 
     # --- Attach to final decision ---
-    state["final_decision"]["top_customers_today"] = top_customers
-    state["final_decision"]["prioritization_logic"] = "risk_proximity_ranking"
+    final_decision.update(compute_strategy(features_df, risk_state))
 
-    return state
+    return {"final_decision": final_decision}
@@ -1,4 +1,3 @@
-from backend.utils.state_sanitizer import sanitize_state 
 def synthesis_agent_node(state):
     """
     Synthesis Agent
@@ -73,5 +72,4 @@ def synthesis_agent_node(state):
     # Attach agent agreement snapshot (important for explainability)
     final_decision["agent_agreement"] = severities
 
-    state["final_decision"] = final_decision
-    return sanitize_state(state)
+    return {"final_decision": final_decision}
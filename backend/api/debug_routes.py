@@ -1,17 +1,202 @@
-from fastapi import APIRouter, HTTPException
-import json
-import os
+from fastapi import APIRouter, HTTPException, Request, Response
+import gzip
+import hashlib
+
+from backend.memory.run_store import RUN_STORE
+from backend.utils.serialization import dumps
 
 router = APIRouter()
 
-DEBUG_DIR = "."  # same dir where files are saved
+# Lists that can be paged with ?offset=&limit=
+PAGINATED_PATHS = [
+    "engineered_signals",
+    "agent_outputs.action_explainability.actions",
+]
+
+# Smaller bodies are cheaper to send as-is
+MIN_COMPRESS_BYTES = 512
+
+
+def _load_zstd():
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+_ZSTD = _load_zstd()
+
+
+# --------------------------------------------------
+# Projection & Pagination
+# --------------------------------------------------
+def _get_path(data, path: list):
+    for key in path:
+        if not isinstance(data, dict) or key not in data:
+            return None, False
+        data = data[key]
+    return data, True
+
+
+def _set_path(data: dict, path: list, value) -> None:
+    for key in path[:-1]:
+        data = data.setdefault(key, {})
+    data[path[-1]] = value
+
+
+def _project(result: dict, fields: str | None) -> dict:
+    """
+    Keeps only the dotted paths listed in `fields` (comma separated).
+    """
+
+    if not fields:
+        return result
+
+    projected = {}
+    for field in fields.split(","):
+        path = [p for p in field.strip().split(".") if p]
+        if not path:
+            continue
+        value, found = _get_path(result, path)
+        if found:
+            _set_path(projected, path, value)
+
+    return projected
+
+
+def _paginate(result: dict, offset: int, limit: int | None) -> dict:
+    """
+    Slices every paginated list present in the (projected) result.
+    Totals are reported under `page`. Mutates `result`, which is a
+    fresh decode from the run store.
+    """
+
+    if offset == 0 and limit is None:
+        return result
+
+    page = {"offset": offset, "limit": limit, "totals": {}}
+
+    for dotted in PAGINATED_PATHS:
+        path = dotted.split(".")
+        items, found = _get_path(result, path)
+        if not found or not isinstance(items, list):
+            continue
+
+        end = None if limit is None else offset + limit
+        _set_path(result, path, items[offset:end])
+        page["totals"][dotted] = len(items)
+
+    result["page"] = page
+    return result
+
+
+# --------------------------------------------------
+# Encoding
+# --------------------------------------------------
+def _negotiate(accept_encoding: str) -> str | None:
+    accepted = {
+        part.split(";")[0].strip().lower()
+        for part in accept_encoding.split(",")
+        if part.strip()
+    }
+
+    if "zstd" in accepted and _ZSTD is not None:
+        return "zstd"
+
+    if "gzip" in accepted:
+        return "gzip"
+
+    return None
+
+
+def _encode(body: bytes, coding: str | None) -> tuple:
+    if coding is None or len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+
+    if coding == "zstd":
+        return _ZSTD.ZstdCompressor(level=3).compress(body), "zstd"
+
+    # mtime=0 keeps the bytes (and so the ETag) stable across requests
+    return gzip.compress(body, compresslevel=6, mtime=0), "gzip"
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+# --------------------------------------------------
+# Routes
+# --------------------------------------------------
+@router.get("/api/runs")
+def list_runs(
+    session_id: str | None = None,
+    since: float | None = None,
+    until: float | None = None,
+    limit: int = 50,
+):
+    return {
+        "store": RUN_STORE.stats(),
+        "runs": RUN_STORE.list(session_id, since, until, min(limit, 500)),
+    }
+
+
+@router.get("/api/debug/{run_id}")
+def get_debug_file(
+    run_id: str,
+    request: Request,
+    fields: str | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+):
+    """
+    Full or partial run result.
+
+    - `fields`: comma-separated dotted paths, e.g.
+      `agent_outputs.evaluation,final_decision`
+    - `offset` / `limit`: page engineered_signals and actions
+    - ETag / If-None-Match: runs are immutable, so the tag is derived
+      from the request alone and a match never loads the payload; the
+      negotiated content-coding is part of the tag (`"<hash>-gzip"`)
+      so each tag names exactly one byte sequence
+    - gzip / zstd per Accept-Encoding
+    """
+
+    if offset < 0 or (limit is not None and limit < 0):
+        raise HTTPException(status_code=400, detail="offset/limit must be >= 0")
+
+    coding = _negotiate(request.headers.get("accept-encoding", ""))
+
+    etag = '"' + hashlib.sha256(
+        f"{run_id}|{fields}|{offset}|{limit}".encode("utf-8")
+    ).hexdigest()[:32] + (f"-{coding}" if coding else "") + '"'
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, max-age=31536000, immutable",
+        "Vary": "Accept-Encoding",
+    }
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        if RUN_STORE.exists(run_id):
+            return Response(status_code=304, headers=headers)
+
+    result = RUN_STORE.get(run_id)
+
+    if result is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+
+    result = _project(result, fields)
+    result = _paginate(result, offset, limit)
 
-@router.get("/api/debug/{filename}")
-def get_debug_file(filename: str):
-    path = os.path.join(DEBUG_DIR, filename)
+    body = dumps(result)
+    body, content_encoding = _encode(body, coding)
 
-    if not os.path.exists(path):
-        raise HTTPException(status_code=404, detail="Debug file not found")
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
 
-    with open(path, "r") as f:
-        return json.load(f)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,43 @@
+from fastapi import APIRouter
+
+from backend.memory.feedback_index import FEEDBACK_INDEX
+
+router = APIRouter()
+
+
+@router.get("/feedback")
+def query_feedback(
+    since: str | None = None,
+    until: str | None = None,
+    overall_status: str | None = None,
+    driver: str | None = None,
+    human_override: bool | None = None,
+    limit: int = 100,
+    offset: int = 0,
+):
+    return {
+        "records": FEEDBACK_INDEX.query(
+            since,
+            until,
+            overall_status,
+            driver,
+            human_override,
+            min(limit, 1000),
+            offset,
+        )
+    }
+
+
+@router.get("/feedback/stats/status-by-day")
+def feedback_status_by_day(since: str | None = None, until: str | None = None):
+    return FEEDBACK_INDEX.status_by_day(since, until)
+
+
+@router.get("/feedback/stats/override-rate")
+def feedback_override_rate(since: str | None = None, until: str | None = None):
+    return FEEDBACK_INDEX.override_rate_by_driver(since, until)
+
+
+@router.post("/feedback/sync")
+def feedback_sync():
+    return {"indexed": FEEDBACK_INDEX.sync(), **FEEDBACK_INDEX.stats()}
@@ -1,10 +1,16 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from datetime import datetime
-import json
 
-from backend.orchestration.graph import run_agentic_graph
-from backend.utils.json_sanitizer import json_safe
+from backend.orchestration.graph import (
+    run_agentic_graph,
+    stream_agentic_graph,
+    GRAPH_REGISTRY,
+)
+from backend.orchestration.jobs import JOB_QUEUE, QueueFullError
+from backend.orchestration.answer_cache import ANSWER_CACHE
+from backend.memory.run_store import RUN_STORE
+from backend.utils.serialization import FastJSONResponse, dumps, to_native
 
 router = APIRouter()
 
@@ -12,36 +18,210 @@ router = APIRouter()
 class UserQuery(BaseModel):
     query: str
     session_id: str | None = None
+    variant: str = "full"
+    # "sync" blocks until the graph finishes; "async" returns a job ID
+    mode: str = "sync"
+    # Force a fresh LLM call instead of a cached explanation
+    # (also skips the answer cache)
+    bypass_llm_cache: bool = False
+    # Force a fresh graph run instead of a cached answer
+    bypass_cache: bool = False
 
 
-@router.post("/ask")
-def ask_ops_ai(payload: UserQuery):
-    # Run agentic graph
-    result = run_agentic_graph(payload.query, payload.session_id)
+def _validate_variant(variant: str) -> None:
+    if variant not in GRAPH_REGISTRY.variants():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown graph variant: {variant}"
+        )
+
+
+def execute_query(
+    query: str,
+    session_id: str | None,
+    variant: str,
+    bypass_llm_cache: bool = False,
+    bypass_cache: bool = False,
+) -> dict:
+    def run():
+        # Run agentic graph
+        result = run_agentic_graph(query, session_id, variant, bypass_llm_cache)
+        return save_and_summarize(result), _cacheable(result)
+
+    if bypass_cache or bypass_llm_cache:
+        summary, _ = run()
+        return {**summary, "answer_cache": "bypass"}
+
+    summary, status = ANSWER_CACHE.get_or_compute(ANSWER_CACHE.key(query, variant), run)
+    if status != "miss":
+        summary = _record_cached_run(summary, query, session_id, status)
+    return {**summary, "answer_cache": status}
+
+
+def _record_cached_run(summary: dict, query: str, session_id: str | None, status: str) -> dict:
+    """
+    A cached (or coalesced) answer still gets its own run under the
+    caller's query and session: a copy of the stored run that produced
+    it. The graph does not run, so no feedback memory is written.
+    """
+
+    source_run_id = summary["run_id"]
+    # The source run may have been evicted; keep at least the decision
+    result = RUN_STORE.get(source_run_id) or {"final_decision": summary.get("final_decision", {})}
+    result.update({
+        "query": query,
+        "session_id": session_id,
+        "answer_cache": {"status": status, "source_run_id": source_run_id},
+    })
+
+    run_id = RUN_STORE.put(result)
+    return {**summary, "run_id": run_id, "debug_file": run_id, "source_run_id": source_run_id}
 
+
+def _cacheable(result: dict) -> bool:
+    # A degraded (fallback) explanation should not be replayed
+    llm = result.get("llm_explainer") or {}
+    return llm.get("source") != "fallback"
+
+
+def save_and_summarize(result: dict) -> dict:
     # ----------------------------------------
-    # ✅ SAVE FULL RESULT TO FILE (DEBUG SAFE)
+    # ✅ SAVE FULL RESULT TO RUN STORE (DEBUG SAFE)
     # ----------------------------------------
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"agentic_debug_result_{timestamp}.json"
-
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(
-            result,
-            f,
-            indent=2,
-            default=str
-        )
+    run_id = RUN_STORE.put(result)
 
-    print(f"\n✅ FULL AGENT OUTPUT SAVED TO FILE: {filename}\n")
+    print(f"\n✅ FULL AGENT OUTPUT SAVED AS RUN: {run_id}\n")
 
     # ----------------------------------------
     # ✅ RETURN SMALL, SAFE RESPONSE
     # ----------------------------------------
-    return json_safe({
+    return to_native({
         "status": "EXECUTED",
-        "debug_file": filename,
+        "run_id": run_id,
+        # Kept for existing clients: GET /api/debug/{debug_file}
+        "debug_file": run_id,
         "agents_ran": list(result.get("agent_outputs", {}).keys()),
         "customers_flagged": len(result.get("engineered_signals", [])),
         "final_decision": result.get("final_decision", {})
     })
+
+
+@router.post("/ask")
+def ask_ops_ai(payload: UserQuery, response: Response):
+    _validate_variant(payload.variant)
+
+    if payload.mode not in {"sync", "async"}:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown mode: {payload.mode}"
+        )
+
+    if payload.mode == "sync":
+        return FastJSONResponse(execute_query(
+            payload.query,
+            payload.session_id,
+            payload.variant,
+            payload.bypass_llm_cache,
+            payload.bypass_cache,
+        ))
+
+    # ----------------------------------------
+    # ✅ ASYNC: QUEUE AND RETURN JOB ID
+    # ----------------------------------------
+    try:
+        job = JOB_QUEUE.submit(
+            execute_query,
+            payload.query,
+            payload.session_id,
+            payload.variant,
+            payload.bypass_llm_cache,
+            payload.bypass_cache,
+            query=payload.query,
+            session_id=payload.session_id,
+            variant=payload.variant,
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    response.status_code = 202
+    return {
+        "status": "QUEUED",
+        "job_id": job["job_id"],
+        "status_url": f"/api/jobs/{job['job_id']}",
+    }
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {dumps(data).decode('utf-8')}\n\n"
+
+
+@router.get("/ask/stream")
+def ask_ops_ai_stream(
+    query: str,
+    session_id: str | None = None,
+    variant: str = "full",
+    bypass_llm_cache: bool = False,
+    bypass_cache: bool = False,
+):
+    """
+    Server-Sent Events: one `node` event per finished graph node,
+    then a `done` event carrying the same summary as POST /ask.
+    A cached answer is sent as a single `done` event.
+    """
+
+    _validate_variant(variant)
+
+    key = ANSWER_CACHE.key(query, variant)
+
+    def events():
+        if not (bypass_cache or bypass_llm_cache):
+            cached = ANSWER_CACHE.peek(key)
+            if cached is not None:
+                summary = _record_cached_run(cached, query, session_id, "hit")
+                yield _sse("done", {**summary, "answer_cache": "hit", "elapsed_ms": 0.0})
+                return
+
+        try:
+            for kind, name, payload, elapsed_ms in stream_agentic_graph(
+                query, session_id, variant, bypass_llm_cache
+            ):
+                if kind == "node":
+                    yield _sse("node", {
+                        "node": name,
+                        "elapsed_ms": elapsed_ms,
+                        "output": payload,
+                    })
+                else:
+                    summary = save_and_summarize(payload)
+                    if _cacheable(payload):
+                        ANSWER_CACHE.put(key, summary)
+                    yield _sse("done", {**summary, "elapsed_ms": elapsed_ms})
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/jobs")
+def list_jobs(limit: int = 50):
+    return {
+        "queue": JOB_QUEUE.stats(),
+        "jobs": [
+            {k: v for k, v in job.items() if k != "result"}
+            for job in JOB_QUEUE.list(limit)
+        ],
+    }
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = JOB_QUEUE.get(job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return FastJSONResponse(job)
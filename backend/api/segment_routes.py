@@ -0,0 +1,44 @@
+from fastapi import APIRouter, HTTPException
+
+from backend.intelligence.segmentation import SEGMENT_DIMENSIONS, SEGMENT_ENGINE
+from backend.utils.serialization import FastJSONResponse
+
+router = APIRouter()
+
+
+@router.get("/segments")
+def list_segment_dimensions():
+    return {"dimensions": SEGMENT_DIMENSIONS, "engine": SEGMENT_ENGINE.stats()}
+
+
+@router.get("/segments/{dimension}")
+def segment_report(
+    dimension: str,
+    limit: int | None = None,
+    attention_only: bool = False,
+    include_risk_state: bool = True,
+):
+    """
+    Per-segment risk state, top customers and agent severities,
+    segments ordered by need for attention.
+    """
+
+    if dimension not in SEGMENT_DIMENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown segment dimension: {dimension}"
+        )
+
+    report = SEGMENT_ENGINE.analyze(dimension)
+    segments = report["segments"]
+
+    if attention_only:
+        segments = [s for s in segments if s["attention_required"]]
+    if limit is not None:
+        segments = segments[:max(limit, 0)]
+    if not include_risk_state:
+        segments = [
+            {k: v for k, v in s.items() if k != "risk_state"} for s in segments
+        ]
+
+    return FastJSONResponse({**report, "segments": segments})
@@ -1,19 +1,88 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from backend.api.ops_chat_routes import router as ops_router
 from backend.api.debug_routes import router as debug_router
+from backend.api.feedback_routes import router as feedback_router
+from backend.api.segment_routes import router as segment_router
+from backend.orchestration.graph import GRAPH_REGISTRY
+from backend.orchestration.routing import ROUTING_STATS
+from backend.orchestration.answer_cache import ANSWER_CACHE
+from backend.orchestration.tracing import TRACER
+from backend.intelligence.feature_store import FEATURE_STORE
+from backend.orchestration.jobs import JOB_QUEUE
+from backend.llm.response_cache import LLM_RESPONSE_CACHE
+from backend.llm.gateway import LLM_GATEWAY
+from backend.memory.feedback_memory import FEEDBACK_WRITER
+from backend.memory.feedback_index import FEEDBACK_INDEX
+from backend.utils.serialization import FastJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Compile every graph variant once, before the first request
+    GRAPH_REGISTRY.warm()
+    # Catch up on feedback written while the API was down
+    FEEDBACK_INDEX.sync()
+    yield
+    JOB_QUEUE.shutdown()
+    FEEDBACK_WRITER.close()
+
 
 app = FastAPI(
     title="Agentic AI Operations Intelligence",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 app.include_router(ops_router, prefix="/api")
 app.include_router(debug_router)
+app.include_router(feedback_router, prefix="/api")
+app.include_router(segment_router, prefix="/api")
 
 @app.get("/")
 def health_check():
     return {"status": "Backend is running"}
 
+@app.get("/api/graphs")
+def graph_registry_stats():
+    return GRAPH_REGISTRY.stats()
+
+@app.get("/api/routing")
+def routing_stats():
+    return ROUTING_STATS.stats()
+
+@app.get("/api/trace")
+def trace_stats():
+    return TRACER.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Prometheus text exposition format
+    return PlainTextResponse(TRACER.prometheus(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/answer-cache")
+def answer_cache_stats():
+    return ANSWER_CACHE.stats()
+
+@app.get("/api/feature-store")
+def feature_store_stats():
+    return FEATURE_STORE.stats()
+
+@app.get("/api/llm-cache")
+def llm_cache_stats():
+    return LLM_RESPONSE_CACHE.stats()
+
+@app.get("/api/feedback-writer")
+def feedback_writer_stats():
+    return FEEDBACK_WRITER.stats()
+
+@app.get("/api/llm-gateway")
+def llm_gateway_stats():
+    return LLM_GATEWAY.stats()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("backend.app:app", host="0.0.0.0", port=8000)
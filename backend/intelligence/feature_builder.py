@@ -1,4 +1,9 @@
-from backend.data.loader import load_customer_data
+import os
+
+import numpy as np
+import pandas as pd
+
+from backend.data.loader import load_customer_data, iter_customer_data
 from backend.intelligence.risk_proximity import compute_customer_risk_scores
 from backend.intelligence.usage_signals import compute_usage_signals
 from backend.intelligence.operational_signals import compute_operational_signals
@@ -7,57 +12,101 @@ from backend.intelligence.risk_representation import (
     compute_cx_stress,
     build_risk_state,
     compute_amplification_score,
+    RiskStateAccumulator,
+)
+from backend.intelligence.scoring_kernel import (
+    INPUT_COLUMNS,
+    SIGNAL_COLUMNS,
+    add_signal_columns,
+    compute_amplification_array,
+    compute_signal_block,
+    score_features,
 )
+from backend.intelligence.prioritization import TopKHeap, top_k_positions
+from backend.utils.serialization import records as to_records
+
+# Chunked mode: stream the source in this many rows (0 = load everything)
+FEATURE_CHUNK_SIZE = int(os.getenv("FEATURE_CHUNK_SIZE", "0"))
+
+# Chunked mode keeps only the K riskiest customers
+FEATURE_TOP_K = int(os.getenv("FEATURE_TOP_K", "100"))
+
+# "fused" (single numpy kernel) or "reference" (modular pandas functions)
+FEATURE_KERNEL = os.getenv("FEATURE_KERNEL", "fused")
+
+# Incremental mode: rescore everyone only when a p75 / p90 moves by more
+# than this fraction; above FEATURE_DELTA_MAX_FRACTION changed rows a full
+# rebuild is cheaper than a delta
+FEATURE_RESCORE_TOLERANCE = float(os.getenv("FEATURE_RESCORE_TOLERANCE", "0.01"))
+FEATURE_DELTA_MAX_FRACTION = float(os.getenv("FEATURE_DELTA_MAX_FRACTION", "0.25"))
+
+# Columns used for global risk context
+RISK_COLUMNS = [
+    "usage_mean",
+    "usage_std",
+    "usage_volatility",
+    "ops_stress",
+    "financial_stress",
+    "cx_stress",
+]
+
+FEATURE_COLUMNS = [
+    "customer_id",
+    "usage_mean",
+    "usage_std",
+    "usage_volatility",
+    "ops_stress",
+    "financial_stress",
+    "cx_stress",
+    "amplification_score",
+]
 
 
-def build_features():
+def build_features(chunk_size: int = FEATURE_CHUNK_SIZE, top_k: int = FEATURE_TOP_K):
     """
     Feature Builder (Orchestrator)
     ------------------------------
     Coordinates all signal modules and returns:
     - Engineered customer-level features
     - Global risk state for agent reasoning
+
+    With chunk_size > 0 the source is streamed (see build_features_chunked)
+    and only the top_k riskiest customers are returned.
     """
 
+    if chunk_size and chunk_size > 0:
+        return build_features_chunked(chunk_size, top_k)
+
     # Load raw data
     df = load_customer_data()
 
-    # Signal computation
-    df = compute_usage_signals(df)
-    df = compute_operational_signals(df)
-    df = compute_financial_signals(df)
-    df = compute_cx_stress(df)
+    if FEATURE_KERNEL == "reference":
+        return build_features_reference(df)
 
-    # Columns used for global risk context
-    risk_columns = [
-        "usage_mean",
-        "usage_std",
-        "usage_volatility",
-        "ops_stress",
-        "financial_stress",
-        "cx_stress",
-    ]
+    # Signals, risk state, amplification and customer_risk_score in one kernel
+    return score_features(df, RISK_COLUMNS, FEATURE_COLUMNS)
+
+
+def build_features_reference(df: pd.DataFrame):
+    """
+    Modular reference path (one pandas pass per signal module).
+    The fused kernel is checked against this in scoring_kernel.check_parity.
+    """
+
+    # Signal computation
+    df = compute_row_signals(df)
 
     # Global risk statistics
-    risk_state = build_risk_state(df, risk_columns)
+    risk_state = build_risk_state(df, RISK_COLUMNS)
 
     # Amplification logic
     df = compute_amplification_score(df, risk_state)
 
     df = compute_customer_risk_scores(df, risk_state)
-    
-    required_columns = [
-    "customer_id",
-    "usage_mean",
-    "usage_std",
-    "usage_volatility",
-    "ops_stress",
-    "financial_stress",
-    "cx_stress",
-    "amplification_score",
-    ]
 
-# Include customer_risk_score ONLY if it exists
+    required_columns = list(FEATURE_COLUMNS)
+
+    # Include customer_risk_score ONLY if it exists
     if "customer_risk_score" in df.columns:
         required_columns.append("customer_risk_score")
 
@@ -65,4 +114,465 @@ def build_features():
 
     return features_df, risk_state
 
-    
+
+def compute_row_signals(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-row signals only (no population statistics), safe to run per chunk.
+    """
+
+    df = compute_usage_signals(df)
+    df = compute_operational_signals(df)
+    df = compute_financial_signals(df)
+    df = compute_cx_stress(df)
+
+    return df
+
+
+def build_features_chunked(chunk_size: int, top_k: int = FEATURE_TOP_K):
+    """
+    Chunked Feature Builder
+    -----------------------
+    Single streaming pass with flat peak memory:
+    - per-row signals computed chunk by chunk
+    - risk distribution accumulated in bounded memory
+    - a min-heap keeps the top_k customers by customer_risk_score
+      (ties go to the earlier row, like a stable sort)
+
+    Amplification needs the final p75s, so it is applied to the
+    surviving top_k rows after the pass.
+    """
+
+    accumulator = RiskStateAccumulator(RISK_COLUMNS)
+    heap = TopKHeap(top_k)
+    row_offset = 0
+    columns = [c for c in FEATURE_COLUMNS if c != "amplification_score"]
+
+    for chunk in iter_customer_data(chunk_size):
+        chunk = add_signal_columns(chunk)
+        accumulator.update(chunk)
+
+        scores = chunk["customer_risk_score"].to_numpy()
+        positions = top_k_positions([scores], top_k)
+        records = to_records(chunk.iloc[positions], columns)
+
+        for position, record in zip(positions, records):
+            record["customer_risk_score"] = float(scores[position])
+            # Earlier rows win ties: larger key = -global row number
+            heap.push((record["customer_risk_score"], -(row_offset + int(position))), record)
+
+        row_offset += len(chunk)
+
+    risk_state = accumulator.result()
+
+    ranked = heap.items()
+    features_df = pd.DataFrame(ranked, columns=columns + ["customer_risk_score"])
+    features_df = compute_amplification_score(features_df, risk_state)
+
+    return features_df[FEATURE_COLUMNS + ["customer_risk_score"]], risk_state
+
+
+# --------------------------------------------------
+# Incremental mode
+# --------------------------------------------------
+_RISK_ROWS = [SIGNAL_COLUMNS.index(col) for col in RISK_COLUMNS]
+_SCORE_ROW = SIGNAL_COLUMNS.index("customer_risk_score")
+
+
+def _input_block(raw: pd.DataFrame) -> np.ndarray:
+    return np.stack([
+        raw[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in INPUT_COLUMNS
+    ])
+
+
+# Ordered id alignment gives up (falls back to a hash lookup of every id)
+# after this many removed / inserted runs
+_ALIGN_MAX_EDITS = 32
+_ALIGN_WINDOW = 256
+
+
+def _equal(a, b) -> np.ndarray:
+    same = a == b
+    if hasattr(same, "to_numpy"):
+        return same.to_numpy(dtype=bool, na_value=False)
+    return np.asarray(same, dtype=bool)
+
+
+def _match_ordered(old, new) -> np.ndarray | None:
+    """
+    Current position of each row of `new` (-1 = added) when `new` is
+    `old` with a few runs of rows removed / inserted and the order of the
+    rest kept; None when that takes more than _ALIGN_MAX_EDITS runs.
+    Only equal ids are ever paired, so a poor guess costs extra rows in
+    the delta, never a wrong match.
+    """
+
+    n, m = len(old), len(new)
+    current = np.full(m, -1, dtype=np.int64)
+    i = j = edits = 0
+
+    while i < n and j < m:
+        span = min(n - i, m - j)
+        same = _equal(old[i:i + span], new[j:j + span])
+        k = span if same.all() else int(np.argmin(same))
+
+        current[j:j + k] = np.arange(i, i + k)
+        i += k
+        j += k
+        if k == span:
+            break
+
+        edits += 1
+        if edits > _ALIGN_MAX_EDITS:
+            return None
+
+        # Skip whichever run is shorter: removed old rows or inserted new ones
+        removed = np.flatnonzero(_equal(old[i:i + _ALIGN_WINDOW], new[j]))
+        inserted = np.flatnonzero(_equal(new[j:j + _ALIGN_WINDOW], old[i]))
+
+        if len(removed) and (not len(inserted) or removed[0] <= inserted[0]):
+            i += int(removed[0])
+        elif len(inserted):
+            j += int(inserted[0])
+        else:
+            # old[i] left, new[j] is a new customer
+            i += 1
+            j += 1
+
+    return current
+
+
+def _differs(old: np.ndarray, new: np.ndarray) -> np.ndarray:
+    # Per column of two input blocks; NaN == NaN
+    return ((old != new) & ~(np.isnan(old) & np.isnan(new))).any(axis=0)
+
+
+def _sorted_values(values: np.ndarray) -> np.ndarray:
+    return np.sort(values[~np.isnan(values)])
+
+
+def _replace_sorted(values: np.ndarray, leaving: np.ndarray, arriving: np.ndarray) -> np.ndarray:
+    """
+    Sorted (NaN-free) column with `leaving` removed and `arriving`
+    inserted: binary searches plus one delete and one insert, instead of
+    re-sorting the column.
+    """
+
+    leaving = _sorted_values(leaving)
+    if len(leaving):
+        positions = np.searchsorted(values, leaving, side="left")
+        # Equal values leave from consecutive slots
+        positions += np.arange(len(leaving)) - np.searchsorted(leaving, leaving, side="left")
+        values = np.delete(values, positions)
+
+    arriving = _sorted_values(arriving)
+    if len(arriving):
+        values = np.insert(values, np.searchsorted(values, arriving), arriving)
+
+    return values
+
+
+class IncrementalFeatureBuilder:
+    """
+    Incremental Feature Builder
+    ---------------------------
+    Keeps per-customer signals and the state behind build_risk_state
+    between runs, so a delta of changed rows does not recompute everyone.
+
+    - Per row it keeps the kernel inputs, the signal block and the
+      amplification score as arrays, never a copy of the raw frame
+    - diff() compares kernel inputs only (raw edits that do not affect
+      scoring are not a delta); customer_ids are aligned in order with a
+      few vectorized compares (edits in place, appended, removed or
+      inserted rows), and by a hash lookup only when the file was
+      reordered or heavily edited. Rows keep first-seen order
+    - Only added / changed rows get their signals computed; removed rows
+      are dropped
+    - Column sums are adjusted by the delta; each risk column is also kept
+      sorted, and the delta is removed / inserted by binary search, so
+      p75 / p90 / max stay exact without a pass over the column
+    - Amplification (p75-relative) is recomputed for everyone only when
+      a p75 / p90 moves by more than `tolerance` (relative); otherwise
+      only the delta rows are scored against the current state
+    - The top-K by customer_risk_score is merged from the delta, with a
+      full re-rank only when a current top-K member scores lower
+    """
+
+    def __init__(self, tolerance: float = FEATURE_RESCORE_TOLERANCE, top_k: int = FEATURE_TOP_K):
+        self.tolerance = tolerance
+        self.top_k = top_k
+        self.risk_state: dict | None = None
+        self._scored_state: dict | None = None
+        self._ids = None
+        self._index: pd.Index | None = None
+        self._inputs: np.ndarray | None = None
+        self._signals: np.ndarray | None = None
+        self._amplification: np.ndarray | None = None
+        self._sum: np.ndarray | None = None
+        self._sorted: list = []
+        self._top: np.ndarray = np.empty(0, dtype=np.int64)
+        self.stats = {"builds": 0, "deltas": 0, "rows_recomputed": 0, "rescores": 0}
+
+    @property
+    def built(self) -> bool:
+        return self._ids is not None
+
+    def __len__(self) -> int:
+        return len(self._ids) if self.built else 0
+
+    # --------------------------------------------------
+    # Full build
+    # --------------------------------------------------
+    def build(self, raw: pd.DataFrame) -> None:
+        # Same kernel as score_features: one signal block, amplification
+        # in one comparison pass against the p75s
+        self._ids = raw["customer_id"].array
+        self._index = None
+        self._inputs = _input_block(raw)
+        self._signals = compute_signal_block(raw)
+
+        risk = self._signals[_RISK_ROWS]
+        self._sum = np.nansum(risk, axis=1)
+        self._sorted = [_sorted_values(values) for values in risk]
+
+        self.risk_state = self._risk_state()
+        self._scored_state = self.risk_state
+        self._amplification = compute_amplification_array(self._signals, self.risk_state)
+
+        self._rank_all()
+        self.stats["builds"] += 1
+
+    # --------------------------------------------------
+    # Delta
+    # --------------------------------------------------
+    def diff(self, raw: pd.DataFrame):
+        """
+        (changed raw rows, removed customer_ids) of `raw` against the
+        current state, compared on the kernel inputs.
+        """
+
+        raw_rows, _, removed = self._align(raw)
+        return raw.iloc[raw_rows], list(self._ids.take(removed))
+
+    def apply_delta(self, changed: pd.DataFrame, removed: list | None = None) -> dict:
+        """
+        Applies added / changed raw rows and removed customer_ids.
+        Returns a summary of what was recomputed.
+        """
+
+        if not self.built:
+            raise RuntimeError("apply_delta() needs a prior build()")
+
+        index = self._id_index()
+        rows = index.get_indexer(changed["customer_id"])
+        removed = index.get_indexer(pd.Index(removed or []))
+
+        return self._apply(changed, rows, removed[removed >= 0])
+
+    def update(self, raw: pd.DataFrame, max_fraction: float = FEATURE_DELTA_MAX_FRACTION) -> dict | None:
+        """
+        diff() + apply_delta() in one step. Returns None, before any
+        signal is computed, when more than `max_fraction` of the rows
+        changed (a full build is cheaper then).
+        """
+
+        raw_rows, rows, removed = self._align(raw)
+
+        if len(raw_rows) + len(removed) > max_fraction * max(len(raw), 1):
+            return None
+
+        return self._apply(raw.iloc[raw_rows], rows, removed)
+
+    def _align(self, raw: pd.DataFrame):
+        """
+        Positions in `raw` of added / changed rows, their current
+        positions (-1 = new customer) and the positions of removed rows.
+        """
+
+        if not self.built:
+            raise RuntimeError("diff() needs a prior build()")
+
+        ids = raw["customer_id"].array
+        inputs = _input_block(raw)
+        n, m = len(self._ids), len(ids)
+
+        current = _match_ordered(self._ids, ids)
+
+        if current is not None and m >= n and (n == 0 or current[n - 1] == n - 1):
+            # Every row in place, possibly with rows appended: no gather
+            changed = np.flatnonzero(_differs(self._inputs, inputs[:, :n]))
+            raw_rows = np.concatenate([changed, np.arange(n, m)])
+            return raw_rows, current[raw_rows], np.empty(0, dtype=np.int64)
+
+        if current is None:
+            current = self._id_index().get_indexer(ids)
+        known = current >= 0
+
+        differs = np.ones(m, dtype=bool)
+        differs[known] = _differs(
+            np.take(self._inputs, current[known], axis=1), np.compress(known, inputs, axis=1)
+        )
+        raw_rows = np.flatnonzero(differs)
+
+        kept = np.zeros(n, dtype=bool)
+        kept[current[known]] = True
+
+        return raw_rows, current[raw_rows], np.flatnonzero(~kept)
+
+    def _apply(self, changed: pd.DataFrame, rows: np.ndarray, removed: np.ndarray) -> dict:
+        delta = compute_signal_block(changed)
+        delta_inputs = _input_block(changed)
+
+        replaced = rows >= 0
+        leaving_rows = np.concatenate([rows[replaced], removed])
+        leaving = self._signals[:, leaving_rows]
+
+        # Running sums and sorted columns
+        self._sum = (
+            self._sum
+            - np.nansum(leaving[_RISK_ROWS], axis=1)
+            + np.nansum(delta[_RISK_ROWS], axis=1)
+        )
+        self._sorted = [
+            _replace_sorted(values, leaving[row], delta[row])
+            for values, row in zip(self._sorted, _RISK_ROWS)
+        ]
+
+        # Only rows that got worse (or are new) can push someone out of
+        # the top-K; a member that got better or left forces a re-rank
+        in_top = np.isin(rows[replaced], self._top)
+        demoted = bool(
+            np.isin(removed, self._top).any()
+            or (delta[_SCORE_ROW, replaced][in_top] < self._signals[_SCORE_ROW, rows[replaced]][in_top]).any()
+        )
+
+        # Changed rows in place
+        self._signals[:, rows[replaced]] = delta[:, replaced]
+        self._inputs[:, rows[replaced]] = delta_inputs[:, replaced]
+
+        # Removed rows out, added rows appended
+        if len(removed):
+            kept = np.ones(len(self._ids), dtype=bool)
+            kept[removed] = False
+            shift = np.cumsum(kept) - 1
+
+            self._ids = self._ids[kept]
+            self._inputs = np.compress(kept, self._inputs, axis=1)
+            self._signals = np.compress(kept, self._signals, axis=1)
+            self._amplification = self._amplification[kept]
+            self._top = shift[self._top[kept[self._top]]]
+            rows = np.where(replaced, shift[np.maximum(rows, 0)], -1)
+            self._index = None
+
+        added = np.flatnonzero(~replaced)
+        if len(added):
+            start = len(self._ids)
+            self._ids = pd.concat(
+                [pd.Series(self._ids), changed["customer_id"].iloc[added]], ignore_index=True
+            ).array
+            self._inputs = np.concatenate([self._inputs, delta_inputs[:, added]], axis=1)
+            self._signals = np.concatenate([self._signals, delta[:, added]], axis=1)
+            self._amplification = np.concatenate([self._amplification, np.zeros(len(added), dtype=np.int64)])
+            rows = rows.copy()
+            rows[added] = np.arange(start, start + len(added))
+            self._index = None
+
+        # Risk state
+        self.risk_state = self._risk_state()
+
+        rescore = self._moved(self._scored_state, self.risk_state)
+        if rescore:
+            compute_amplification_array(self._signals, self.risk_state, out=self._amplification)
+            self._scored_state = self.risk_state
+            self.stats["rescores"] += 1
+        elif len(rows):
+            self._amplification[rows] = compute_amplification_array(delta, self._scored_state)
+
+        if demoted or len(self._top) < min(self.top_k, len(self._ids)):
+            self._rank_all()
+        else:
+            self._rank(np.concatenate([self._top, rows]))
+
+        self.stats["deltas"] += 1
+        self.stats["rows_recomputed"] += len(rows)
+
+        return {
+            "changed": int(replaced.sum()),
+            "added": len(added),
+            "removed": len(removed),
+            "rescored": rescore,
+            "reranked": demoted,
+        }
+
+    def _id_index(self) -> pd.Index:
+        # Built on first use after the customer set changes
+        if self._index is None:
+            self._index = pd.Index(self._ids)
+        return self._index
+
+    def _risk_state(self) -> dict:
+        risk_state = {}
+
+        for i, col in enumerate(RISK_COLUMNS):
+            values = self._sorted[i]
+
+            if len(values):
+                # Selection on sorted data: same result as np.nanquantile
+                p75, p90 = np.quantile(values, [0.75, 0.90])
+                stats = (self._sum[i] / len(values), p75, p90, values[-1])
+            else:
+                stats = (np.nan,) * 4
+
+            risk_state[col] = dict(zip(("mean", "p75", "p90", "max"), map(float, stats)))
+
+        return risk_state
+
+    def _moved(self, before: dict, after: dict) -> bool:
+        for col in RISK_COLUMNS:
+            for stat in ("p75", "p90"):
+                old, new = before[col][stat], after[col][stat]
+                if abs(new - old) > self.tolerance * max(abs(old), 1e-12):
+                    return True
+        return False
+
+    # --------------------------------------------------
+    # Top-K
+    # --------------------------------------------------
+    def _rank(self, candidates: np.ndarray) -> None:
+        positions = np.unique(candidates[candidates >= 0])
+        scores = self._signals[_SCORE_ROW, positions]
+
+        # Highest score first, earlier row first on ties
+        self._top = positions[top_k_positions([scores], self.top_k)]
+
+    def _rank_all(self) -> None:
+        self._top = np.asarray(top_k_positions([self._signals[_SCORE_ROW]], self.top_k), dtype=np.int64)
+
+    # --------------------------------------------------
+    # Views
+    # --------------------------------------------------
+    def _frame(self, rows: np.ndarray | None = None) -> pd.DataFrame:
+        # Copies: later deltas update the arrays in place
+        take = (lambda values: values.copy()) if rows is None else (lambda values: values[rows])
+
+        columns = {"customer_id": self._ids if rows is None else self._ids.take(rows)}
+        for col in FEATURE_COLUMNS + ["customer_risk_score"]:
+            if col in SIGNAL_COLUMNS:
+                columns[col] = take(self._signals[SIGNAL_COLUMNS.index(col)])
+        columns["amplification_score"] = take(self._amplification)
+
+        return pd.DataFrame(columns, copy=False)[FEATURE_COLUMNS + ["customer_risk_score"]]
+
+    def features(self):
+        """
+        (features_df, risk_state) in the build_features() layout,
+        customer_risk_score included.
+        """
+        return self._frame(), self.risk_state
+
+    def top(self, k: int = 10) -> pd.DataFrame:
+        if k > self.top_k:
+            rows = top_k_positions([self._signals[_SCORE_ROW]], k)
+        else:
+            rows = self._top[:k]
+
+        return self._frame(np.asarray(rows, dtype=np.int64))
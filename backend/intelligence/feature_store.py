@@ -0,0 +1,290 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+
+import pandas as pd
+
+from backend.data.loader import get_data_path, load_customer_data
+from backend.intelligence.feature_builder import (
+    build_features,
+    IncrementalFeatureBuilder,
+    FEATURE_CHUNK_SIZE,
+    FEATURE_DELTA_MAX_FRACTION,
+    FEATURE_KERNEL,
+    FEATURE_TOP_K,
+)
+from backend.intelligence.risk_proximity import compute_weighted_risk_score
+from backend.intelligence.prioritization import select_top_k
+
+# Bump whenever signal / risk logic changes so persisted entries are ignored
+FEATURE_VERSION = "3"
+
+# Optional on-disk tier (disabled unless a directory is configured)
+FEATURE_STORE_DIR = os.getenv("FEATURE_STORE_DIR")
+
+
+def _parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FeatureStore:
+    """
+    Feature Store
+    -------------
+    Memoizes (features_df, risk_state) per dataset fingerprint.
+
+    - Fingerprint = file mtime + size + content hash + FEATURE_VERSION
+      (+ top-K in chunked mode)
+    - Content is re-hashed only when mtime/size change
+    - In-memory entry is replaced as soon as the fingerprint moves
+    - Optional Parquet + JSON persistence under FEATURE_STORE_DIR
+    - When the dataset changes, only the changed customer rows are
+      recomputed (IncrementalFeatureBuilder) unless too many changed
+    """
+
+    def __init__(self, data_path: Path | None = None, cache_dir: str | None = None):
+        self.data_path = Path(data_path) if data_path else get_data_path()
+        self.cache_dir = Path(cache_dir) if cache_dir else (
+            Path(FEATURE_STORE_DIR) if FEATURE_STORE_DIR else None
+        )
+
+        self._lock = threading.Lock()
+        self._stat_key: Tuple | None = None
+        self._content_hash: str | None = None
+        self._entry: Dict | None = None
+        self._builder: IncrementalFeatureBuilder | None = None
+        self._stats = {
+            "hits": 0, "misses": 0, "disk_hits": 0, "invalidations": 0,
+            "incremental_updates": 0,
+        }
+
+    # --------------------------------------------------
+    # Fingerprint
+    # --------------------------------------------------
+    def fingerprint(self) -> str:
+        stat = self.data_path.stat()
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+
+        if stat_key != self._stat_key or self._content_hash is None:
+            self._content_hash = _hash_file(self.data_path)
+            self._stat_key = stat_key
+
+        # Chunked mode keeps only the top-K rows: never share entries with full mode
+        mode = f"-chunked{FEATURE_TOP_K}" if FEATURE_CHUNK_SIZE > 0 else ""
+
+        return f"v{FEATURE_VERSION}{mode}-{self._content_hash[:16]}"
+
+    # --------------------------------------------------
+    # Public API
+    # --------------------------------------------------
+    def get(self):
+        """
+        Returns (features_df, risk_state) for the current dataset.
+        Callers receive copies and may mutate them freely.
+        """
+
+        with self._lock:
+            entry = self._current()
+            features_df = entry["features_df"]
+            risk_state = entry["risk_state"]
+
+        return features_df.copy(), copy.deepcopy(risk_state)
+
+    def view(self):
+        """
+        Returns the shared (features_df, risk_state) without copying.
+        Read-only: callers must not mutate either object.
+        """
+
+        with self._lock:
+            entry = self._current()
+            return entry["features_df"], entry["risk_state"]
+
+    def top(self, k: int = 10):
+        """
+        Returns (top_k_df, risk_state): the k customers with the highest
+        customer_risk_score, without copying the full feature frame.
+        """
+
+        with self._lock:
+            entry = self._current()
+
+            if self._builder is not None:
+                top_df = self._builder.top(k)
+            else:
+                features_df = entry["features_df"]
+                if "customer_risk_score" not in features_df.columns:
+                    features_df = features_df.assign(
+                        customer_risk_score=compute_weighted_risk_score(features_df)
+                    )
+                top_df = select_top_k(features_df, "customer_risk_score", k).reset_index(drop=True)
+
+            risk_state = copy.deepcopy(entry["risk_state"])
+
+        return top_df.copy(), risk_state
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entry = None
+            self._builder = None
+            self._stat_key = None
+            self._content_hash = None
+
+    def stats(self) -> Dict:
+        return {
+            **self._stats,
+            "fingerprint": self._entry["fingerprint"] if self._entry else None,
+            "persistent": self._disk_enabled(),
+            "incremental": self._builder.stats if self._builder else None,
+            "quantile_rank_error": self._quantile_error(),
+        }
+
+    def _quantile_error(self) -> Dict | None:
+        """
+        {column: rank error bound} when the served p75 / p90 are
+        approximate (chunked mode), None when they are exact.
+        """
+
+        risk_state = self._entry["risk_state"] if self._entry else {}
+        bounds = {
+            col: stats["quantile_rank_error"]
+            for col, stats in risk_state.items()
+            if stats.get("approximate")
+        }
+        return bounds or None
+
+    # --------------------------------------------------
+    # Internals
+    # --------------------------------------------------
+    def _current(self) -> Dict:
+        fingerprint = self.fingerprint()
+
+        if self._entry is not None and self._entry["fingerprint"] == fingerprint:
+            self._stats["hits"] += 1
+        else:
+            if self._entry is not None:
+                self._stats["invalidations"] += 1
+            self._entry = self._load_or_build(fingerprint)
+
+        return self._entry
+
+    def _load_or_build(self, fingerprint: str) -> Dict:
+        entry = self._update_incrementally(fingerprint)
+        if entry is not None:
+            return entry
+
+        entry = self._read_disk(fingerprint)
+
+        if entry is not None:
+            self._stats["disk_hits"] += 1
+            self._builder = None
+            return entry
+
+        self._stats["misses"] += 1
+
+        if FEATURE_CHUNK_SIZE > 0 or FEATURE_KERNEL == "reference":
+            self._builder = None
+            features_df, risk_state = build_features()
+        else:
+            self._builder = IncrementalFeatureBuilder()
+            self._builder.build(load_customer_data())
+            features_df, risk_state = self._builder.features()
+
+        entry = {
+            "fingerprint": fingerprint,
+            "features_df": features_df,
+            "risk_state": risk_state,
+        }
+        self._write_disk(entry)
+        return entry
+
+    def _update_incrementally(self, fingerprint: str) -> Dict | None:
+        """
+        Applies the changed rows to the live builder, if there is one and
+        the change is small enough to be worth it.
+        """
+
+        builder = self._builder
+        if builder is None or not builder.built:
+            return None
+
+        # Checks the delta size before computing any signal
+        if builder.update(load_customer_data(), FEATURE_DELTA_MAX_FRACTION) is None:
+            return None
+
+        self._stats["incremental_updates"] += 1
+
+        features_df, risk_state = builder.features()
+        entry = {
+            "fingerprint": fingerprint,
+            "features_df": features_df,
+            "risk_state": risk_state,
+        }
+        self._write_disk(entry)
+        return entry
+
+    def _disk_enabled(self) -> bool:
+        return self.cache_dir is not None and _parquet_available()
+
+    def _disk_paths(self, fingerprint: str):
+        base = self.cache_dir / fingerprint
+        return base.with_suffix(".parquet"), base.with_suffix(".risk.json")
+
+    def _read_disk(self, fingerprint: str) -> Dict | None:
+        if not self._disk_enabled():
+            return None
+
+        df_path, risk_path = self._disk_paths(fingerprint)
+        if not (df_path.exists() and risk_path.exists()):
+            return None
+
+        try:
+            features_df = pd.read_parquet(df_path)
+            with open(risk_path, "r", encoding="utf-8") as f:
+                risk_state = json.load(f)
+        except Exception:
+            # Corrupt / partial entry: rebuild from source
+            return None
+
+        return {
+            "fingerprint": fingerprint,
+            "features_df": features_df,
+            "risk_state": risk_state,
+        }
+
+    def _write_disk(self, entry: Dict) -> None:
+        if not self._disk_enabled():
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        df_path, risk_path = self._disk_paths(entry["fingerprint"])
+
+        # Write-then-rename so readers never see a half-written entry
+        tmp_df = df_path.with_suffix(".parquet.tmp")
+        entry["features_df"].to_parquet(tmp_df, index=False)
+        os.replace(tmp_df, df_path)
+
+        tmp_risk = risk_path.with_suffix(".tmp")
+        with open(tmp_risk, "w", encoding="utf-8") as f:
+            json.dump(entry["risk_state"], f)
+        os.replace(tmp_risk, risk_path)
+
+
+# Process-wide store used by the graph
+FEATURE_STORE = FeatureStore()
@@ -1,3 +1,126 @@
+import heapq
+
+import numpy as np
+import pandas as pd
+
+
+# --------------------------------------------------
+# Top-K selection (O(n) instead of a full sort)
+# --------------------------------------------------
+def _sort_key(values, ascending: bool) -> np.ndarray:
+    """
+    Float key where smaller = better; NaN always ranks last
+    (as in sort_values).
+    """
+
+    key = np.asarray(values, dtype=np.float64)
+    key = key.copy() if ascending else -key
+    key[np.isnan(key)] = np.inf
+    return key
+
+
+def top_k_positions(
+    columns: list,
+    k: int,
+    ascending=False,
+    tie_break: str = "first",
+) -> np.ndarray:
+    """
+    Positions of the k best rows, best first.
+
+    - columns: score arrays, compared lexicographically (first = primary)
+    - ascending: one bool for all columns or one per column
+    - tie_break: "first" (earlier row wins, like a stable sort) or "last"
+
+    np.argpartition finds the k-th primary value in O(n); only rows at or
+    above it (k plus boundary ties) are sorted on the full key.
+    """
+
+    if tie_break not in ("first", "last"):
+        raise ValueError("tie_break must be 'first' or 'last'")
+
+    n = len(columns[0]) if columns else 0
+    k = max(0, min(int(k), n))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+
+    directions = ascending if isinstance(ascending, (list, tuple)) else [ascending] * len(columns)
+    keys = [_sort_key(col, asc) for col, asc in zip(columns, directions)]
+    primary = keys[0]
+
+    if k < n:
+        kth = primary[np.argpartition(primary, k - 1)[k - 1]]
+        candidates = np.flatnonzero(primary <= kth)
+    else:
+        candidates = np.arange(n)
+
+    position = candidates if tie_break == "first" else -candidates
+    # np.lexsort sorts by the last key first
+    order = np.lexsort([position] + [key[candidates] for key in reversed(keys)])
+
+    return candidates[order[:k]]
+
+
+def select_top_k(
+    df: pd.DataFrame,
+    by,
+    k: int = 10,
+    ascending=False,
+    tie_break: str = "first",
+) -> pd.DataFrame:
+    """
+    DataFrame equivalent of df.sort_values(by, ascending).head(k),
+    in linear time. `by` is a column name or a list of them.
+    """
+
+    by = [by] if isinstance(by, str) else list(by)
+
+    for col in by:
+        if col not in df.columns:
+            raise ValueError(f"{col} missing for prioritization")
+
+    positions = top_k_positions(
+        [df[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in by],
+        k,
+        ascending=ascending,
+        tie_break=tie_break,
+    )
+
+    return df.iloc[positions]
+
+
+class TopKHeap:
+    """
+    Streaming Top-K
+    ---------------
+    Keeps the k items with the largest (score, ...) keys seen so far in a
+    min-heap: O(log k) per push, O(k) memory. Use a negated row number as
+    the last key element to make earlier rows win ties.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap = []
+
+    def push(self, key: tuple, item) -> None:
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, (key, item))
+        elif key > self._heap[0][0]:
+            heapq.heapreplace(self._heap, (key, item))
+
+    def items(self) -> list:
+        """
+        Items, best first.
+        """
+        return [item for _, item in sorted(self._heap, key=lambda entry: entry[0], reverse=True)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+# --------------------------------------------------
+# Prioritization
+# --------------------------------------------------
 def prioritize_customers(df, top_k=10):
     """
     Selects the most risky customers for immediate attention.
@@ -6,10 +129,6 @@ def prioritize_customers(df, top_k=10):
     if "customer_risk_score" not in df.columns:
         raise ValueError("customer_risk_score missing for prioritization")
 
-    prioritized = (
-        df.sort_values("customer_risk_score", ascending=False)
-          .head(top_k)
-          .copy()
-    )
+    prioritized = select_top_k(df, "customer_risk_score", top_k).copy()
 
     return prioritized
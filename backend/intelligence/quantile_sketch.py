@@ -0,0 +1,139 @@
+import math
+import os
+
+import numpy as np
+
+# Target normalized rank error for streamed percentiles (0.001 = 0.1%)
+RISK_SKETCH_EPSILON = float(os.getenv("RISK_SKETCH_EPSILON", "0.001"))
+
+# Capacity shrink factor between KLL levels
+_C = 2.0 / 3.0
+
+
+def k_for_epsilon(epsilon: float) -> int:
+    """
+    Smallest KLL k whose single-quantile rank error is <= epsilon
+    (empirical bound 2.296 / k^0.9723, as used by Apache DataSketches).
+    """
+    if epsilon <= 0:
+        raise ValueError("epsilon must be > 0")
+    return max(8, math.ceil((2.296 / epsilon) ** (1 / 0.9723)))
+
+
+def epsilon_for_k(k: int) -> float:
+    return 2.296 / k ** 0.9723
+
+
+class KLLSketch:
+    """
+    KLL Quantile Sketch
+    -------------------
+    Mergeable streaming quantiles in O(k) memory per column.
+
+    - Level h holds items of weight 2^h; a full level is sorted and every
+      other item (random offset) is promoted to the level above
+    - Sketches built per chunk or per partition merge level by level,
+      so percentiles can be computed incrementally or in parallel
+    - Exact (numpy linear interpolation) until the first compaction,
+      i.e. while no more than k values have been seen
+    """
+
+    def __init__(self, k: int | None = None, epsilon: float = RISK_SKETCH_EPSILON, seed: int = 0):
+        self.k = k or k_for_epsilon(epsilon)
+        self.count = 0
+        self.compactions = 0
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    # --------------------------------------------------
+    # Building
+    # --------------------------------------------------
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        self.count += len(values)
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """
+        Folds `other` into this sketch (in place) and returns self.
+        """
+
+        if other.count == 0:
+            return self
+
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+
+        for h, items in enumerate(other._levels):
+            self._levels[h] = np.concatenate([self._levels[h], items])
+
+        self.count += other.count
+        self.compactions += other.compactions
+        self.k = min(self.k, other.k)
+        self._compress()
+        return self
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - 1 - level
+        return max(2, int(math.ceil(self.k * _C ** depth)))
+
+    def _compress(self) -> None:
+        while True:
+            total = sum(len(items) for items in self._levels)
+            capacity = sum(self._capacity(h) for h in range(len(self._levels)))
+            if total <= capacity:
+                return
+
+            for h, items in enumerate(self._levels):
+                if len(items) >= self._capacity(h):
+                    break
+
+            if h == len(self._levels) - 1:
+                self._levels.append(np.empty(0))
+
+            items = np.sort(items)
+            # Odd leftover stays behind so weights are preserved
+            keep = items[-1:] if len(items) % 2 else items[:0]
+            pairs = items[: len(items) - len(keep)]
+            promoted = pairs[int(self._rng.integers(0, 2))::2]
+
+            self._levels[h] = keep
+            self._levels[h + 1] = np.concatenate([self._levels[h + 1], promoted])
+            self.compactions += 1
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+    @property
+    def epsilon(self) -> float:
+        """
+        Normalized rank error bound (0 while still exact).
+        """
+        return epsilon_for_k(self.k) if self.compactions else 0.0
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return float("nan")
+
+        if len(self._levels) == 1 or not self.compactions:
+            return float(np.quantile(self._levels[0], q))
+
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([
+            np.full(len(level), 2 ** h, dtype=np.int64)
+            for h, level in enumerate(self._levels)
+        ])
+        order = np.argsort(items, kind="stable")
+        cumulative = np.cumsum(weights[order])
+
+        target = q * cumulative[-1]
+        index = min(int(np.searchsorted(cumulative, target, side="left")), len(items) - 1)
+        return float(items[order][index])
+
+    def nbytes(self) -> int:
+        return sum(items.nbytes for items in self._levels)
@@ -1,16 +1,24 @@
 import pandas as pd
 import numpy as np
 
+from backend.intelligence.prioritization import select_top_k
+from backend.utils.serialization import records
 
-def _to_python(value):
+
+def compute_weighted_risk_score(df: pd.DataFrame) -> pd.Series:
     """
-    Convert numpy scalars to native Python types
+    Row-local weighted customer risk score used for prioritization
+    (no population statistics needed, so it can be computed per chunk)
     """
-    if isinstance(value, (np.integer,)):
-        return int(value)
-    if isinstance(value, (np.floating,)):
-        return float(value)
-    return value
+
+    score = (
+        0.35 * df["usage_volatility"].fillna(0)
+        + 0.30 * df["ops_stress"].fillna(0)
+        + 0.25 * df["financial_stress"].fillna(0) / 10000
+        + 0.10 * df["cx_stress"].fillna(0)
+    )
+
+    return score.replace([np.inf, -np.inf], 0).fillna(0).astype(float)
 
 
 def compute_customer_risk_scores(df: pd.DataFrame, risk_state: dict) -> pd.DataFrame:
@@ -38,13 +46,11 @@ def build_watchlist(df: pd.DataFrame, top_n: int = 5) -> list:
     Build Top-N customer watchlist (JSON safe)
     """
 
-    watchlist_df = (
-        df.sort_values("overall_risk_score", ascending=False)
-        .head(top_n)
-        .reset_index(drop=True)
-    )
+    watchlist_df = select_top_k(df, "overall_risk_score", top_n).reset_index(drop=True)
 
-    records = watchlist_df[
+    # 🔥 CRITICAL: native Python types (converted per column)
+    return records(
+        watchlist_df,
         [
             "customer_id",
             "overall_risk_score",
@@ -52,13 +58,5 @@ def build_watchlist(df: pd.DataFrame, top_n: int = 5) -> list:
             "financial_stress",
             "cx_stress",
             "amplification_score",
-        ]
-    ].to_dict(orient="records")
-
-    # 🔥 CRITICAL: convert numpy types to Python types
-    safe_records = []
-    for row in records:
-        safe_row = {k: _to_python(v) for k, v in row.items()}
-        safe_records.append(safe_row)
-
-    return safe_records
+        ],
+    )
@@ -1,5 +1,8 @@
+import numpy as np
 import pandas as pd
 
+from backend.intelligence.quantile_sketch import KLLSketch, RISK_SKETCH_EPSILON
+
 
 def compute_cx_stress(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -19,19 +22,97 @@ def build_risk_state(df: pd.DataFrame, columns: list) -> dict:
     Provides statistical context for agents
     """
 
+    # One pass per statistic over all columns (a single sort per column
+    # serves both percentiles)
+    values = df[columns]
+    means = values.mean()
+    maxes = values.max()
+    quantiles = values.quantile([0.75, 0.90])
+
     risk_state = {}
 
     for col in columns:
         risk_state[col] = {
-            "mean": float(df[col].mean()),
-            "p75": float(df[col].quantile(0.75)),
-            "p90": float(df[col].quantile(0.90)),
-            "max": float(df[col].max()),
+            "mean": float(means[col]),
+            "p75": float(quantiles.at[0.75, col]),
+            "p90": float(quantiles.at[0.90, col]),
+            "max": float(maxes[col]),
         }
 
     return risk_state
 
 
+class RiskStateAccumulator:
+    """
+    Streaming risk distribution
+    ---------------------------
+    Builds the same mean / p75 / p90 / max contract as build_risk_state
+    from chunks or partitions, in bounded memory.
+
+    - mean and max are exact
+    - quantiles come from one KLL sketch per column (rank error <= epsilon,
+      exact while the row count fits in the sketch); each column of the
+      result says whether its p75 / p90 are approximate and carries the
+      normalized rank error bound (quantile_rank_error)
+    - accumulators built in parallel combine with merge()
+    """
+
+    def __init__(self, columns: list, epsilon: float = RISK_SKETCH_EPSILON, seed: int = 0):
+        self.columns = columns
+        self.count = 0
+        self._sum = {col: 0.0 for col in columns}
+        self._max = {col: -np.inf for col in columns}
+        self._sketch = {
+            col: KLLSketch(epsilon=epsilon, seed=seed + i)
+            for i, col in enumerate(columns)
+        }
+
+    def update(self, df: pd.DataFrame) -> None:
+        if len(df) == 0:
+            return
+
+        self.count += len(df)
+
+        for col in self.columns:
+            values = df[col].to_numpy(dtype=float)
+            self._sum[col] += float(np.nansum(values))
+            self._max[col] = max(self._max[col], float(np.nanmax(values)))
+            self._sketch[col].update(values)
+
+    def merge(self, other: "RiskStateAccumulator") -> "RiskStateAccumulator":
+        self.count += other.count
+
+        for col in self.columns:
+            self._sum[col] += other._sum[col]
+            self._max[col] = max(self._max[col], other._max[col])
+            self._sketch[col].merge(other._sketch[col])
+
+        return self
+
+    def error_bound(self) -> dict:
+        """
+        Normalized rank error of p75 / p90 per column (0.0 = exact).
+        """
+        return {col: self._sketch[col].epsilon for col in self.columns}
+
+    def result(self) -> dict:
+        risk_state = {}
+        error_bound = self.error_bound()
+
+        for col in self.columns:
+            sketch = self._sketch[col]
+            risk_state[col] = {
+                "mean": self._sum[col] / sketch.count if sketch.count else float("nan"),
+                "p75": sketch.quantile(0.75),
+                "p90": sketch.quantile(0.90),
+                "max": self._max[col] if sketch.count else float("nan"),
+                "approximate": error_bound[col] > 0,
+                "quantile_rank_error": error_bound[col],
+            }
+
+        return risk_state
+
+
 def compute_amplification_score(
     df: pd.DataFrame, risk_state: dict
 ) -> pd.DataFrame:
@@ -0,0 +1,348 @@
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+# Raw columns the kernel reads: rows whose inputs are unchanged keep
+# their signals
+INPUT_COLUMNS = [
+    "monthly_usage_kwh",
+    "peak_usage_kwh",
+    "avg_outage_hours",
+    "payment_delay_days",
+    "last_bill_amount",
+    "service_tickets",
+]
+
+# Row order of the signal block (one contiguous float64 row per column)
+SIGNAL_COLUMNS = [
+    "usage_mean",
+    "usage_std",
+    "usage_volatility",
+    "ops_stress",
+    "financial_stress",
+    "cx_stress",
+    "customer_risk_score",
+]
+
+# Weighted prioritization score (same as compute_weighted_risk_score)
+_WEIGHTS = {
+    "usage_volatility": 0.35,
+    "ops_stress": 0.30,
+    "financial_stress": 0.25,
+    "cx_stress": 0.10,
+}
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    return df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def compute_signal_block(df: pd.DataFrame) -> np.ndarray:
+    """
+    Fused Signal Kernel
+    -------------------
+    All row-local signals in one preallocated (7, n) float64 block,
+    computed in place with numpy ufuncs (no intermediate frames):
+    usage mean / std / volatility, ops, financial and cx stress and the
+    weighted customer_risk_score.
+
+    Arithmetic follows the modular functions operation by operation, so
+    the results are bit-identical to the reference path.
+    """
+
+    n = len(df)
+    block = np.empty((len(SIGNAL_COLUMNS), n), dtype=np.float64)
+    usage_mean, usage_std, volatility, ops, fin, cx, score = block
+
+    monthly = _column(df, "monthly_usage_kwh")
+
+    # Usage
+    np.copyto(usage_mean, monthly)
+    np.subtract(_column(df, "peak_usage_kwh"), monthly, out=usage_std)
+    np.abs(usage_std, out=usage_std)
+    np.add(usage_mean, 1e-6, out=volatility)
+    np.divide(usage_std, volatility, out=volatility)
+
+    # Operational
+    np.copyto(ops, _column(df, "avg_outage_hours"))
+
+    # Financial: bill * (1 + delay / 30)
+    np.divide(_column(df, "payment_delay_days"), 30, out=fin)
+    np.add(fin, 1, out=fin)
+    np.multiply(_column(df, "last_bill_amount"), fin, out=fin)
+
+    # CX
+    np.multiply(_column(df, "service_tickets"), volatility, out=cx)
+
+    # Weighted score: NaN terms count as 0, non-finite totals become 0
+    term = np.empty(n, dtype=np.float64)
+    score.fill(0.0)
+    for name, weight in _WEIGHTS.items():
+        values = block[SIGNAL_COLUMNS.index(name)]
+        np.multiply(weight, np.nan_to_num(values, nan=0.0, posinf=np.inf, neginf=-np.inf), out=term)
+        if name == "financial_stress":
+            np.divide(term, 10000, out=term)
+        np.add(score, term, out=score)
+    score[~np.isfinite(score)] = 0.0
+
+    return block
+
+
+def risk_state_from_block(block: np.ndarray, columns: list) -> dict:
+    """
+    mean / p75 / p90 / max for the given signal columns, with a single
+    quantile call over the block (selection, not a sort per percentile).
+    """
+
+    rows = [SIGNAL_COLUMNS.index(col) for col in columns]
+    values = block[rows]
+
+    means = np.nanmean(values, axis=1)
+    maxes = np.nanmax(values, axis=1)
+    p75, p90 = np.nanquantile(values, [0.75, 0.90], axis=1)
+
+    return {
+        col: {
+            "mean": float(means[i]),
+            "p75": float(p75[i]),
+            "p90": float(p90[i]),
+            "max": float(maxes[i]),
+        }
+        for i, col in enumerate(columns)
+    }
+
+
+def compute_amplification_array(block: np.ndarray, risk_state: dict, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Number of ops / financial / cx stresses above their p75 (int64).
+    """
+
+    n = block.shape[1]
+    out = np.zeros(n, dtype=np.int64) if out is None else out
+    out.fill(0)
+
+    for col in ("ops_stress", "financial_stress", "cx_stress"):
+        out += block[SIGNAL_COLUMNS.index(col)] > risk_state[col]["p75"]
+
+    return out
+
+
+def add_signal_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Writes every row-local signal (and customer_risk_score) onto df.
+    """
+
+    block = compute_signal_block(df)
+    for i, col in enumerate(SIGNAL_COLUMNS):
+        df[col] = block[i]
+    return df
+
+
+def score_features(df: pd.DataFrame, risk_columns: list, feature_columns: list):
+    """
+    Fused Feature Scoring
+    ---------------------
+    Raw frame → (features_df, risk_state) in two passes over contiguous
+    arrays: row signals, then amplification against the p75s. The raw
+    frame is not modified or copied.
+    """
+
+    block = compute_signal_block(df)
+    risk_state = risk_state_from_block(block, risk_columns)
+    amplification = compute_amplification_array(block, risk_state)
+
+    columns = {"customer_id": df["customer_id"].to_numpy()}
+    for col in feature_columns:
+        if col in SIGNAL_COLUMNS:
+            columns[col] = block[SIGNAL_COLUMNS.index(col)]
+    columns["amplification_score"] = amplification
+    columns["customer_risk_score"] = block[SIGNAL_COLUMNS.index("customer_risk_score")]
+
+    features_df = pd.DataFrame(columns, copy=False)[feature_columns + ["customer_risk_score"]]
+
+    return features_df, risk_state
+
+
+# --------------------------------------------------
+# Parity & Benchmark
+# --------------------------------------------------
+def check_parity(df: pd.DataFrame | None = None) -> dict:
+    """
+    Fused kernel vs the modular reference path on the same raw frame.
+    Without `df`, the frame served by FEATURE_STORE (the path requests
+    actually use) is compared against the reference too.
+    """
+
+    from backend.data.loader import load_customer_data
+    from backend.intelligence.feature_builder import (
+        build_features_reference,
+        FEATURE_COLUMNS,
+        RISK_COLUMNS,
+    )
+    from backend.intelligence.risk_proximity import compute_weighted_risk_score
+
+    raw = load_customer_data() if df is None else df
+
+    fused_df, fused_state = score_features(raw, RISK_COLUMNS, FEATURE_COLUMNS)
+    ref_df, ref_state = build_features_reference(raw.copy())
+    ref_score = compute_weighted_risk_score(ref_df)
+
+    columns = {
+        col: bool(np.array_equal(
+            fused_df[col].to_numpy(), ref_df[col].to_numpy(), equal_nan=True
+        ))
+        for col in FEATURE_COLUMNS if col != "customer_id"
+    }
+    columns["customer_risk_score"] = bool(
+        np.array_equal(fused_df["customer_risk_score"].to_numpy(), ref_score.to_numpy())
+    )
+
+    report = {
+        "rows": len(raw),
+        "columns_identical": columns,
+        "risk_state_identical": fused_state == ref_state,
+        "max_abs_diff": max(
+            float(np.nanmax(np.abs(fused_df[col].to_numpy() - ref_df[col].to_numpy())))
+            for col in FEATURE_COLUMNS if col != "customer_id"
+        ),
+    }
+
+    if df is None:
+        report["store"] = _check_store_parity(ref_df, ref_state, ref_score, fused_df)
+
+    report["incremental"] = check_incremental_parity(raw)
+
+    return report
+
+
+def check_incremental_parity(raw: pd.DataFrame, seed: int = 0) -> dict:
+    """
+    IncrementalFeatureBuilder after one apply_delta (rows edited, removed
+    and appended) vs build_features() on the edited frame. Rescoring is
+    forced (tolerance 0), so everything but the running means must be
+    identical.
+    """
+
+    from backend.intelligence.feature_builder import (
+        IncrementalFeatureBuilder,
+        FEATURE_COLUMNS,
+        RISK_COLUMNS,
+    )
+    from backend.intelligence.prioritization import select_top_k
+
+    rng = np.random.default_rng(seed)
+    n = len(raw)
+
+    edited = raw.copy()
+    rows = rng.choice(n, max(1, n // 100), replace=False)
+    outage = edited.columns.get_loc("avg_outage_hours")
+    edited.iloc[rows, outage] = edited.iloc[rows, outage] * 1.5 + 1
+    edited = edited.drop(index=edited.index[rng.choice(n, max(1, n // 500), replace=False)])
+    added = edited.iloc[:5].assign(customer_id=edited["customer_id"].iloc[:5] + "-new")
+    edited = pd.concat([edited, added], ignore_index=True)
+
+    builder = IncrementalFeatureBuilder(tolerance=0.0)
+    builder.build(raw)
+    summary = builder.apply_delta(*builder.diff(edited))
+
+    # build_features() on a frame (the fused path)
+    inc_df, inc_state = builder.features()
+    ref_df, ref_state = score_features(edited, RISK_COLUMNS, FEATURE_COLUMNS)
+    ref_top = select_top_k(ref_df, "customer_risk_score", 10)
+
+    return {
+        "delta": summary,
+        "layout_identical": list(inc_df.columns) == list(ref_df.columns)
+        and bool((inc_df.dtypes == ref_df.dtypes).all()),
+        "columns_identical": {
+            col: bool(np.array_equal(
+                inc_df[col].to_numpy(), ref_df[col].to_numpy(), equal_nan=col != "customer_id"
+            ))
+            for col in ref_df.columns
+        },
+        "risk_state_identical": all(
+            inc_state[col][stat] == ref_state[col][stat]
+            for col in RISK_COLUMNS for stat in ("p75", "p90", "max")
+        ),
+        "means_close": all(
+            np.isclose(inc_state[col]["mean"], ref_state[col]["mean"], rtol=1e-9)
+            for col in RISK_COLUMNS
+        ),
+        "top_10_identical": list(builder.top(10)["customer_id"]) == list(ref_top["customer_id"]),
+    }
+
+
+def _check_store_parity(
+    ref_df: pd.DataFrame, ref_state: dict, ref_score: pd.Series, fused_df: pd.DataFrame
+) -> dict:
+    from backend.intelligence.feature_builder import FEATURE_COLUMNS
+    from backend.intelligence.feature_store import FEATURE_STORE
+    from backend.intelligence.prioritization import select_top_k
+
+    store_df, store_state = FEATURE_STORE.view()
+    top_df, _ = FEATURE_STORE.top(10)
+    ref_top = select_top_k(ref_df, "customer_risk_score", 10)
+
+    ref_df = ref_df.assign(customer_risk_score=ref_score)
+
+    return {
+        "incremental_builder": FEATURE_STORE.stats()["incremental"] is not None,
+        "columns_identical": {
+            col: bool(np.array_equal(
+                store_df[col].to_numpy(), ref_df[col].to_numpy(), equal_nan=col != "customer_id"
+            ))
+            for col in FEATURE_COLUMNS + ["customer_risk_score"]
+        },
+        # The reference keeps loaded integer usage columns; compare with the kernel
+        "layout_matches_kernel": list(store_df.columns) == list(fused_df.columns)
+        and bool((store_df.dtypes == fused_df.dtypes).all()),
+        "risk_state_identical": store_state == ref_state,
+        "top_10_identical": list(top_df["customer_id"]) == list(ref_top["customer_id"]),
+    }
+
+
+def benchmark(repeats: int = 5, scale: int = 1) -> dict:
+    from backend.data.loader import load_customer_data
+    from backend.intelligence.feature_builder import (
+        build_features_reference,
+        IncrementalFeatureBuilder,
+        FEATURE_COLUMNS,
+        RISK_COLUMNS,
+    )
+    from backend.intelligence.risk_proximity import compute_weighted_risk_score
+
+    raw = load_customer_data()
+    if scale > 1:
+        raw = pd.concat([raw] * scale, ignore_index=True)
+
+    def reference():
+        features_df, _ = build_features_reference(raw.copy())
+        features_df["customer_risk_score"] = compute_weighted_risk_score(features_df)
+
+    def fused():
+        score_features(raw, RISK_COLUMNS, FEATURE_COLUMNS)
+
+    def store_build():
+        # What FEATURE_STORE runs on a miss (default, non-chunked mode)
+        IncrementalFeatureBuilder().build(raw)
+
+    def best_ms(fn):
+        best = float("inf")
+        for _ in range(repeats):
+            started = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - started)
+        return round(best * 1000, 2)
+
+    return {
+        "rows": len(raw),
+        "reference_ms": best_ms(reference),
+        "fused_ms": best_ms(fused),
+        "store_build_ms": best_ms(store_build),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps({"parity": check_parity(), "benchmark": benchmark(scale=20)}, indent=2))
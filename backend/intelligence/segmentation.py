@@ -0,0 +1,278 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from backend.data.loader import load_customer_data
+from backend.intelligence.feature_builder import FEATURE_COLUMNS, RISK_COLUMNS
+from backend.intelligence.feature_store import FEATURE_STORE
+from backend.intelligence.prioritization import top_k_positions
+from backend.intelligence.scoring_kernel import (
+    SIGNAL_COLUMNS,
+    compute_amplification_array,
+    compute_signal_block,
+    risk_state_from_block,
+)
+from backend.agents.synthesis_agent import synthesis_agent_node
+
+SEGMENT_DIMENSIONS = ["region", "city", "contract_type"]
+
+# Customers listed per segment
+SEGMENT_TOP_K = int(os.getenv("SEGMENT_TOP_K", "10"))
+
+# Above this many segments the work is spread over a process pool
+SEGMENT_POOL_MIN_SEGMENTS = int(os.getenv("SEGMENT_POOL_MIN_SEGMENTS", "1000"))
+SEGMENT_WORKERS = int(os.getenv("SEGMENT_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Severity from lift = segment share above a global percentile / population
+# share above it: high when the p90 lift reaches SEGMENT_HIGH_LIFT, medium
+# when the p75 or p90 lift reaches SEGMENT_MEDIUM_LIFT
+SEGMENT_HIGH_LIFT = float(os.getenv("SEGMENT_HIGH_LIFT", "1.5"))
+SEGMENT_MEDIUM_LIFT = float(os.getenv("SEGMENT_MEDIUM_LIFT", "1.2"))
+
+# Smaller segments are reported but never flagged (shares too noisy)
+SEGMENT_MIN_CUSTOMERS = int(os.getenv("SEGMENT_MIN_CUSTOMERS", "30"))
+
+# Agent dimension → stress signal
+SEVERITY_SIGNALS = {
+    "operations": "ops_stress",
+    "finance": "financial_stress",
+    "cx": "cx_stress",
+}
+
+_SEVERITY_RANK = {"high": 2, "medium": 1, "low": 0}
+
+
+def _shares_above(block: np.ndarray, global_state: Dict) -> Dict:
+    """
+    {agent: {"p75": share, "p90": share}} of rows at or above the
+    global p75 / p90 of that agent's stress signal.
+    """
+
+    n = max(block.shape[1], 1)
+    shares = {}
+    for agent, col in SEVERITY_SIGNALS.items():
+        values = block[SIGNAL_COLUMNS.index(col)]
+        shares[agent] = {
+            p: float(np.count_nonzero(values >= global_state[col][p]) / n)
+            for p in ("p75", "p90")
+        }
+    return shares
+
+
+# --------------------------------------------------
+# Per-segment work (module level so worker processes can import it)
+# --------------------------------------------------
+def _analyze_segment(
+    name: str,
+    customer_ids: np.ndarray,
+    block: np.ndarray,
+    amplification: np.ndarray,
+    global_state: Dict,
+    baseline: Dict,
+    top_k: int,
+) -> Dict:
+    """
+    Risk state, top-K and severities for one segment's rows.
+
+    Severities come from the segment's whole distribution: how much more
+    often its customers sit above the global p75 / p90 than the population
+    does (`baseline` shares). The top-K is only the customer list.
+    """
+
+    score = block[SIGNAL_COLUMNS.index("customer_risk_score")]
+    top = top_k_positions([score], top_k)
+
+    top_customers = []
+    for pos in top:
+        record = {"customer_id": str(customer_ids[pos])}
+        for col in FEATURE_COLUMNS[1:]:
+            if col == "amplification_score":
+                record[col] = int(amplification[pos])
+            else:
+                record[col] = float(block[SIGNAL_COLUMNS.index(col), pos])
+        record["customer_risk_score"] = float(score[pos])
+        top_customers.append(record)
+
+    customers = int(block.shape[1])
+    small_sample = customers < SEGMENT_MIN_CUSTOMERS
+
+    shares = _shares_above(block, global_state)
+    stress_profile, severities = {}, {}
+    for agent, share in shares.items():
+        lift = {
+            p: share[p] / baseline[agent][p] if baseline[agent][p] else 0.0
+            for p in ("p75", "p90")
+        }
+        stress_profile[agent] = {
+            "share_above_p75": round(share["p75"], 4),
+            "share_above_p90": round(share["p90"], 4),
+            "lift_p75": round(lift["p75"], 3),
+            "lift_p90": round(lift["p90"], 3),
+        }
+
+        if small_sample:
+            severities[agent] = "low"
+        elif lift["p90"] >= SEGMENT_HIGH_LIFT:
+            severities[agent] = "high"
+        elif max(lift.values()) >= SEGMENT_MEDIUM_LIFT:
+            severities[agent] = "medium"
+        else:
+            severities[agent] = "low"
+
+    decision = synthesis_agent_node({
+        "agent_outputs": {agent: {"severity": s} for agent, s in severities.items()}
+    })["final_decision"]
+
+    return {
+        "segment": name,
+        "customers": customers,
+        "small_sample": small_sample,
+        "overall_status": decision["overall_status"],
+        "attention_required": decision["attention_required"],
+        "severities": severities,
+        "stress_profile": stress_profile,
+        # Mean p75 / p90 lift over the three stresses (1.0 = population)
+        "attention_score": round(float(np.mean([
+            (p["lift_p75"] + p["lift_p90"]) / 2 for p in stress_profile.values()
+        ])), 3),
+        "mean_risk_score": float(score.mean()) if len(score) else 0.0,
+        "risk_state": risk_state_from_block(block, RISK_COLUMNS),
+        "top_customers": top_customers,
+    }
+
+
+def _analyze_batch(batch: List[tuple], global_state: Dict, baseline: Dict, top_k: int) -> List[Dict]:
+    return [
+        _analyze_segment(name, ids, block, amp, global_state, baseline, top_k)
+        for name, ids, block, amp in batch
+    ]
+
+
+def _attention_key(segment: Dict) -> tuple:
+    ranks = [_SEVERITY_RANK.get(s, 0) for s in segment["severities"].values()]
+    return (ranks.count(2), ranks.count(1), segment["attention_score"], segment["mean_risk_score"])
+
+
+# --------------------------------------------------
+# Engine
+# --------------------------------------------------
+class SegmentEngine:
+    """
+    Segment Engine
+    --------------
+    Per-segment risk analysis for one categorical dimension
+    (region / city / contract_type) without running the graph per segment.
+
+    - Signals come from the fused kernel over the full table, once
+    - Rows are grouped with a single stable sort on the segment codes;
+      each segment is then a contiguous slice of the signal block
+    - Many segments are spread across a process pool in batches
+    - Results are cached per dimension until the dataset changes
+    """
+
+    def __init__(
+        self,
+        top_k: int = SEGMENT_TOP_K,
+        workers: int = SEGMENT_WORKERS,
+        pool_min_segments: int = SEGMENT_POOL_MIN_SEGMENTS,
+    ):
+        self.top_k = top_k
+        self.workers = workers
+        self.pool_min_segments = pool_min_segments
+        self._lock = threading.Lock()
+        self._cache: Dict = {}
+        self._stats = {"hits": 0, "misses": 0, "pooled_runs": 0}
+
+    def analyze(self, dimension: str, df: pd.DataFrame | None = None) -> Dict:
+        """
+        {dimension, segments: [...]} with segments ordered by need for
+        attention (high severities, then medium, then mean risk score).
+        """
+
+        if dimension not in SEGMENT_DIMENSIONS:
+            raise ValueError(f"Unknown segment dimension: {dimension}")
+
+        if df is not None:
+            return self._analyze(df, dimension)
+
+        fingerprint = FEATURE_STORE.fingerprint()
+        key = (dimension, fingerprint, self.top_k)
+
+        with self._lock:
+            if key in self._cache:
+                self._stats["hits"] += 1
+                return self._cache[key]
+
+        report = self._analyze(load_customer_data(), dimension)
+        report["fingerprint"] = fingerprint
+
+        with self._lock:
+            self._stats["misses"] += 1
+            # Only the current dataset version is worth keeping
+            self._cache = {k: v for k, v in self._cache.items() if k[1] == fingerprint}
+            self._cache[key] = report
+
+        return report
+
+    def _analyze(self, df: pd.DataFrame, dimension: str) -> Dict:
+        block = compute_signal_block(df)
+        global_state = risk_state_from_block(block, RISK_COLUMNS)
+        amplification = compute_amplification_array(block, global_state)
+        baseline = _shares_above(block, global_state)
+
+        codes, names = pd.factorize(df[dimension].astype(str), sort=True)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+
+        # Reordered once; each segment below is a slice (view) of these
+        block = block[:, order]
+        amplification = amplification[order]
+        customer_ids = df["customer_id"].to_numpy()[order]
+
+        segments = [
+            (
+                str(name),
+                customer_ids[bounds[i]:bounds[i + 1]],
+                block[:, bounds[i]:bounds[i + 1]],
+                amplification[bounds[i]:bounds[i + 1]],
+            )
+            for i, name in enumerate(names)
+        ]
+
+        if len(segments) >= self.pool_min_segments and self.workers > 1:
+            results = self._run_pool(segments, global_state, baseline)
+            self._stats["pooled_runs"] += 1
+        else:
+            results = _analyze_batch(segments, global_state, baseline, self.top_k)
+
+        results.sort(key=_attention_key, reverse=True)
+
+        return {
+            "dimension": dimension,
+            "segment_count": len(results),
+            "global_risk_state": global_state,
+            "population_shares": baseline,
+            "segments": results,
+        }
+
+    def _run_pool(self, segments: List[tuple], global_state: Dict, baseline: Dict) -> List[Dict]:
+        size = max(1, -(-len(segments) // (self.workers * 4)))
+        batches = [segments[i:i + size] for i in range(0, len(segments), size)]
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [
+                pool.submit(_analyze_batch, batch, global_state, baseline, self.top_k)
+                for batch in batches
+            ]
+            return [segment for future in futures for segment in future.result()]
+
+    def stats(self) -> Dict:
+        return {**self._stats, "cached_reports": len(self._cache)}
+
+
+# Process-wide engine used by the API
+SEGMENT_ENGINE = SegmentEngine()
@@ -0,0 +1,143 @@
+"""
+Fake LLM Provider
+-----------------
+Local stand-in for the Groq chat completions API, for exercising the
+gateway's timeouts, retries and circuit breaker without network access.
+
+    python -m backend.llm.fake_provider --port 8765 --latency 0.2 --fail-rate 0.3
+    GROQ_BASE_URL=http://127.0.0.1:8765 GROQ_API_KEY=fake uvicorn backend.app:app
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+
+def make_handler(
+    latency: float = 0.0,
+    fail_rate: float = 0.0,
+    fail_status: int = 503,
+    fail_first: int = 0,
+):
+    """
+    Builds a request handler with fixed latency and a random failure rate;
+    the first `fail_first` requests always fail with `fail_status`.
+    Served requests are counted on the handler class (`handler.requests`),
+    along with the most requests ever in flight at once (`max_in_flight`)
+    and responses the client hung up on (`abandoned`, e.g. a timeout).
+    """
+
+    class FakeProviderHandler(BaseHTTPRequestHandler):
+        requests = 0
+        in_flight = 0
+        max_in_flight = 0
+        abandoned = 0
+        _lock = threading.Lock()
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            cls = type(self)
+            with self._lock:
+                cls.requests += 1
+                cls.in_flight += 1
+                cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+                forced_failure = cls.requests <= fail_first
+
+            try:
+                self._respond(forced_failure)
+            finally:
+                with self._lock:
+                    cls.in_flight -= 1
+
+        def _respond(self, forced_failure: bool):
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+
+            if self.path != COMPLETIONS_PATH:
+                return self._send(404, {"error": {"message": "not found"}})
+
+            time.sleep(latency)
+
+            if forced_failure or random.random() < fail_rate:
+                return self._send(fail_status, {"error": {"message": "fake provider failure"}})
+
+            prompt = body.get("messages", [{}])[-1].get("content", "")
+            return self._send(200, {
+                "id": "fake-completion",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {
+                        "role": "assistant",
+                        "content": f"Fake executive summary ({len(prompt)} prompt chars).",
+                    },
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+
+        def _send(self, status: int, payload: dict):
+            data = json.dumps(payload).encode("utf-8")
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            except ConnectionError:
+                # Client gave up (timeout / deadline) before the response
+                with self._lock:
+                    type(self).abandoned += 1
+                self.close_connection = True
+
+    return FakeProviderHandler
+
+
+class FakeProviderServer(ThreadingHTTPServer):
+    """
+    Threaded server that treats a client hanging up as normal (the
+    gateway cancels requests on timeout) instead of printing a traceback.
+    """
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+def serve(port: int = 0, **behaviour) -> ThreadingHTTPServer:
+    """
+    Starts the fake provider on a background thread and returns the server
+    (`server.server_address[1]` is the bound port).
+    """
+
+    server = FakeProviderServer(("127.0.0.1", port), make_handler(**behaviour))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Groq-compatible LLM provider")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--fail-status", type=int, default=503)
+    parser.add_argument("--fail-first", type=int, default=0)
+    args = parser.parse_args()
+
+    server = FakeProviderServer(
+        ("127.0.0.1", args.port),
+        make_handler(args.latency, args.fail_rate, args.fail_status, args.fail_first),
+    )
+    print(f"Fake LLM provider on http://127.0.0.1:{args.port}")
+    server.serve_forever()
@@ -0,0 +1,271 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Dict, List
+
+import groq
+
+# Per-attempt timeout and overall deadline for one completion
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "15"))
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "30"))
+
+# Retries after the first attempt (jittered exponential backoff)
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "4"))
+
+# Concurrent provider calls allowed across the whole process
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+
+# Circuit breaker: open after N consecutive failures, probe again after M seconds
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+
+class LLMUnavailableError(Exception):
+    """Raised when a completion cannot be produced (after retries)."""
+
+
+class CircuitOpenError(LLMUnavailableError):
+    """Raised without calling the provider while the breaker is open."""
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (asyncio.TimeoutError, groq.APIConnectionError)):
+        return True
+    if isinstance(error, groq.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker: closed → open → half_open → closed.
+    Only one probe call is let through while half-open.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = LLM_BREAKER_FAILURES,
+        reset_seconds: float = LLM_BREAKER_RESET_SECONDS,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_seconds:
+                    return False
+                self.state = "half_open"
+
+            # half_open: a single probe at a time
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """
+        Call ended without saying anything about provider health (e.g. a
+        4xx, or the deadline ran out while queued): state unchanged, a
+        half-open probe slot is freed.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+
+class LLMGateway:
+    """
+    LLM Gateway
+    -----------
+    Single entry point for chat completions.
+
+    - AsyncGroq client on one dedicated event loop thread
+    - Per-attempt timeout plus an overall deadline per call; time spent
+      waiting for a concurrency slot counts against the deadline
+    - Jittered exponential retries on timeouts, 429 and 5xx
+    - Process-wide semaphore caps concurrent provider calls
+    - Circuit breaker fails fast while the provider is down; only
+      transport errors, provider timeouts, 429 and 5xx count as failures
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: float = LLM_TIMEOUT_SECONDS,
+        deadline_seconds: float = LLM_DEADLINE_SECONDS,
+        max_retries: int = LLM_MAX_RETRIES,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.timeout_seconds = timeout_seconds
+        self.deadline_seconds = deadline_seconds
+        self.max_retries = max_retries
+        self.max_concurrency = max_concurrency
+        self.breaker = breaker or CircuitBreaker()
+
+        self._loop = None
+        self._client = None
+        self._semaphore = None
+        self._start_lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retries": 0,
+            "short_circuited": 0,
+            "queue_timeouts": 0,
+        }
+
+    # --------------------------------------------------
+    # Public API
+    # --------------------------------------------------
+    async def acomplete(self, messages: List[Dict], **params) -> str:
+        """
+        Await a completion from any event loop.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._complete(messages, **params), self._ensure_loop()
+        )
+        return await asyncio.wrap_future(future)
+
+    def complete(self, messages: List[Dict], **params) -> str:
+        """
+        Blocking bridge for synchronous graph nodes.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._complete(messages, **params), self._ensure_loop()
+        )
+        return future.result()
+
+    def stats(self) -> Dict:
+        return {
+            **self._stats,
+            "breaker_state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "max_concurrency": self.max_concurrency,
+        }
+
+    # --------------------------------------------------
+    # Internals
+    # --------------------------------------------------
+    def _ensure_loop(self):
+        if self._loop is None:
+            with self._start_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(
+                        target=loop.run_forever,
+                        name="llm-gateway",
+                        daemon=True,
+                    ).start()
+                    self._loop = loop
+        return self._loop
+
+    def _get_client(self):
+        # Created lazily on the gateway loop; retries are handled here
+        if self._client is None:
+            self._client = groq.AsyncGroq(
+                api_key=os.getenv("GROQ_API_KEY"),
+                timeout=self.timeout_seconds,
+                max_retries=0,
+            )
+        return self._client
+
+    async def _complete(self, messages: List[Dict], **params) -> str:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self._stats["calls"] += 1
+
+        if not self.breaker.allow():
+            self._stats["short_circuited"] += 1
+            raise CircuitOpenError("LLM provider circuit is open")
+
+        deadline = time.monotonic() + self.deadline_seconds
+        attempt = 0
+        provider_failed = False
+
+        while True:
+            remaining = deadline - time.monotonic()
+            stage = "queue"
+
+            try:
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+
+                # Waiting for a slot counts against the deadline too
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=remaining)
+                try:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+
+                    stage = "provider"
+                    response = await asyncio.wait_for(
+                        self._get_client().chat.completions.create(
+                            messages=messages, **params
+                        ),
+                        timeout=min(self.timeout_seconds, remaining),
+                    )
+                finally:
+                    self._semaphore.release()
+
+                text = response.choices[0].message.content.strip()
+                self.breaker.record_success()
+                self._stats["succeeded"] += 1
+                return text
+
+            except Exception as e:
+                provider_failed = provider_failed or (stage == "provider" and _is_retryable(e))
+
+                backoff = random.uniform(
+                    0,
+                    min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** attempt),
+                )
+                out_of_time = time.monotonic() + backoff >= deadline
+
+                if not _is_retryable(e) or attempt >= self.max_retries or out_of_time:
+                    if provider_failed:
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.release()
+                    if stage == "queue":
+                        self._stats["queue_timeouts"] += 1
+                    self._stats["failed"] += 1
+                    reason = "deadline exceeded" if isinstance(e, asyncio.TimeoutError) else str(e)
+                    raise LLMUnavailableError(reason) from e
+
+                attempt += 1
+                self._stats["retries"] += 1
+                await asyncio.sleep(backoff)
+
+
+# Process-wide gateway shared by every LLM caller
+LLM_GATEWAY = LLMGateway()
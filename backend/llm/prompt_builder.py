@@ -0,0 +1,134 @@
+import csv
+import io
+import json
+import os
+from typing import Dict, List
+
+# Upper bound on the estimated size of the user prompt
+LLM_PROMPT_TOKEN_BUDGET = int(os.getenv("LLM_PROMPT_TOKEN_BUDGET", "900"))
+
+# Only the fields the explanation actually refers to
+CUSTOMER_FIELDS = [
+    "customer_id",
+    "customer_risk_score",
+    "usage_volatility",
+    "ops_stress",
+    "financial_stress",
+    "cx_stress",
+    "amplification_score",
+]
+
+DECISION_FIELDS = [
+    "overall_status",
+    "primary_driver",
+    "summary",
+    "confidence",
+    "agent_agreement",
+]
+
+PROMPT_TEMPLATE = """You are an enterprise risk analyst.
+
+Explain in simple language:
+- Why these customers need attention
+- Provide a short executive summary
+
+Do NOT invent data.
+Do NOT suggest actions.
+
+Top Customers (CSV):
+{customers}
+Final Decision (JSON):
+{decision}
+"""
+
+
+def _load_encoder():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+_ENCODER = _load_encoder()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Local token estimate: tiktoken when installed, else ~4 chars per token.
+    """
+    if _ENCODER is not None:
+        return len(_ENCODER.encode(text))
+    return (len(text) + 3) // 4
+
+
+def _round(value, digits: int = 2):
+    if isinstance(value, float):
+        return round(value, digits)
+    return value
+
+
+def project_customers(customers: List[Dict]) -> List[Dict]:
+    return [
+        {field: _round(row.get(field)) for field in CUSTOMER_FIELDS if field in row}
+        for row in customers
+    ]
+
+
+def project_decision(final_decision: Dict) -> Dict:
+    return {
+        field: _round(final_decision[field])
+        for field in DECISION_FIELDS
+        if field in final_decision
+    }
+
+
+def _to_csv(rows: List[Dict]) -> str:
+    if not rows:
+        return ""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0].keys()), lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def build_explainer_prompt(
+    top_customers: List[Dict],
+    final_decision: Dict,
+    token_budget: int = LLM_PROMPT_TOKEN_BUDGET,
+) -> Dict:
+    """
+    Prompt Builder
+    --------------
+    Projects, rounds and CSV-encodes the explainer inputs, dropping the
+    lowest-ranked customers until the prompt fits `token_budget`
+    (at least one customer is always kept).
+
+    Returns the prompt plus the compacted inputs and token accounting.
+    """
+
+    rows = project_customers(top_customers)
+    decision = project_decision(final_decision)
+    decision_json = json.dumps(decision, separators=(",", ":"), default=str)
+
+    kept = len(rows)
+    while True:
+        prompt = PROMPT_TEMPLATE.format(
+            customers=_to_csv(rows[:kept]),
+            decision=decision_json,
+        )
+        tokens = estimate_tokens(prompt)
+        if tokens <= token_budget or kept <= 1:
+            break
+        kept -= 1
+
+    return {
+        "prompt": prompt,
+        "customers": rows[:kept],
+        "decision": decision,
+        "prompt_tokens": tokens,
+        "token_budget": token_budget,
+        "customers_in_prompt": kept,
+        "customers_dropped": len(rows) - kept,
+    }
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
+# In-memory tier
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "256"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+
+# Optional disk tier (e.g. "backend/memory/llm_cache.sqlite3")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+
+
+def cache_key(
+    model: str,
+    temperature: float,
+    messages: list,
+    payload: Any = None,
+    **params,
+) -> str:
+    """
+    Canonical content hash of everything that shapes an LLM answer.
+    Key order and whitespace never change the hash.
+    """
+
+    canonical = json.dumps(
+        {
+            "model": model,
+            "temperature": temperature,
+            "messages": messages,
+            "payload": payload,
+            "params": params,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    LLM Response Cache
+    ------------------
+    Content-addressed cache in front of the chat completion call.
+
+    - LRU in memory, every entry expires after `ttl_seconds`
+    - Optional SQLite tier shared across workers / restarts
+    - Hit / miss counters for both tiers
+    """
+
+    def __init__(
+        self,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+        path: str | None = LLM_CACHE_PATH,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0}
+
+        if self.path:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS llm_cache (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL,
+                        stored_at REAL NOT NULL
+                    )
+                    """
+                )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return value
+                del self._entries[key]
+
+        disk_entry = self._disk_get(key, now)
+
+        with self._lock:
+            if disk_entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            # Promote with the original timestamp so the TTL still holds
+            value, stored_at = disk_entry
+            self._stats["disk_hits"] += 1
+            self._remember(key, value, stored_at)
+
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+
+        with self._lock:
+            self._remember(key, value, now)
+
+        if self.path:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, stored_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, value, now),
+                )
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self._stats["bypassed"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+        if self.path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "persistent": bool(self.path),
+            }
+
+    def _remember(self, key: str, value: str, stored_at: float) -> None:
+        # Caller must hold self._lock
+        self._entries[key] = (value, stored_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_get(self, key: str, now: float) -> tuple | None:
+        if not self.path:
+            return None
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, stored_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            if now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+
+        return row
+
+
+# Process-wide cache used by the LLM explainer
+LLM_RESPONSE_CACHE = LLMResponseCache()
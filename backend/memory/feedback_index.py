@@ -0,0 +1,381 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from backend.utils.serialization import loads
+from backend.memory.feedback_memory import (
+    FEEDBACK_WRITER,
+    flatten_feedback,
+)
+
+FEEDBACK_INDEX_PATH = os.getenv(
+    "FEEDBACK_INDEX_PATH", "backend/memory/feedback_index.sqlite3"
+)
+
+
+class FeedbackIndex:
+    """
+    Feedback Index
+    --------------
+    SQLite index over feedback memory for learning loops and analytics.
+
+    - One row per record, indexed on timestamp, overall_status,
+      primary_driver (one row per driver) and human_override
+    - Rollup tables keep status-per-day and override-per-driver counts
+      current on insert, so unfiltered aggregates never scan records
+    - Idempotent: records are keyed by content hash, so re-ingesting
+      rotated segments or archives never double counts
+    - The read offset of a JSONL file is kept per path together with the
+      file's identity (device, inode, hash of its first line); when the
+      active log is rotated and recreated the identity changes and the
+      new file is read from the start. Lines that fail to decode are
+      skipped and counted
+    """
+
+    def __init__(self, path: str = FEEDBACK_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stats = {"skipped_lines": 0, "offset_resets": 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS feedback (
+                    entry_id TEXT PRIMARY KEY,
+                    ts TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    overall_status TEXT,
+                    primary_driver TEXT,
+                    human_override INTEGER NOT NULL,
+                    confidence REAL,
+                    raw TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_fb_ts ON feedback (ts);
+                CREATE INDEX IF NOT EXISTS idx_fb_status ON feedback (overall_status, ts);
+                CREATE INDEX IF NOT EXISTS idx_fb_override ON feedback (human_override, ts);
+
+                CREATE TABLE IF NOT EXISTS feedback_drivers (
+                    entry_id TEXT NOT NULL,
+                    driver TEXT NOT NULL,
+                    ts TEXT NOT NULL,
+                    human_override INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_fbd_driver ON feedback_drivers (driver, ts);
+                CREATE INDEX IF NOT EXISTS idx_fbd_entry ON feedback_drivers (entry_id);
+
+                CREATE TABLE IF NOT EXISTS rollup_status_day (
+                    day TEXT NOT NULL,
+                    overall_status TEXT NOT NULL,
+                    n INTEGER NOT NULL,
+                    PRIMARY KEY (day, overall_status)
+                );
+
+                CREATE TABLE IF NOT EXISTS rollup_driver (
+                    driver TEXT PRIMARY KEY,
+                    total INTEGER NOT NULL,
+                    overrides INTEGER NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS ingest_state (
+                    source TEXT PRIMARY KEY,
+                    offset INTEGER NOT NULL,
+                    identity TEXT
+                );
+                """
+            )
+
+            # Indexes created before file identities were tracked
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(ingest_state)")}
+            if "identity" not in columns:
+                conn.execute("ALTER TABLE ingest_state ADD COLUMN identity TEXT")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    # --------------------------------------------------
+    # Ingestion
+    # --------------------------------------------------
+    def add(self, entries: Iterable[Dict]) -> int:
+        """
+        Index raw feedback entries ({"timestamp", "feedback"}).
+        Returns how many were new.
+        """
+        return self._add_rows(flatten_feedback(e) for e in entries)
+
+    def _add_rows(self, rows: Iterable[Dict]) -> int:
+        added = 0
+
+        with self._lock, self._connect() as conn:
+            for row in rows:
+                entry_id = hashlib.sha1(row["raw"].encode("utf-8")).hexdigest()
+                ts = row["timestamp"] or ""
+                day = ts[:10]
+                status = row["overall_status"] or "unknown"
+                override = int(bool(row["human_override"]))
+
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO feedback (entry_id, ts, day, overall_status, "
+                    "primary_driver, human_override, confidence, raw) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        entry_id, ts, day, status, row["primary_driver"],
+                        override, row["confidence"], row["raw"],
+                    ),
+                ).rowcount
+
+                if not inserted:
+                    continue
+                added += 1
+
+                drivers = [d for d in (row["primary_driver"] or "").split(",") if d] or ["none"]
+                conn.executemany(
+                    "INSERT INTO feedback_drivers (entry_id, driver, ts, human_override) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(entry_id, d, ts, override) for d in drivers],
+                )
+
+                conn.execute(
+                    "INSERT INTO rollup_status_day (day, overall_status, n) VALUES (?, ?, 1) "
+                    "ON CONFLICT (day, overall_status) DO UPDATE SET n = n + 1",
+                    (day, status),
+                )
+                conn.executemany(
+                    "INSERT INTO rollup_driver (driver, total, overrides) VALUES (?, 1, ?) "
+                    "ON CONFLICT (driver) DO UPDATE SET "
+                    "total = total + 1, overrides = overrides + excluded.overrides",
+                    [(d, override) for d in drivers],
+                )
+
+        return added
+
+    def sync(self, memory_path: Path | None = None) -> int:
+        """
+        Catch up from files: active log (from the last offset),
+        rotated segments and compacted archives.
+        """
+
+        memory_path = Path(memory_path or FEEDBACK_WRITER.path)
+        segment_dir = memory_path.parent / FEEDBACK_WRITER.segment_dir.name
+        archive_dir = memory_path.parent / FEEDBACK_WRITER.archive_dir.name
+
+        added = 0
+        sources = [memory_path]
+        sources += sorted(segment_dir.glob("*.jsonl")) if segment_dir.exists() else []
+
+        for source in sources:
+            if source.exists():
+                added += self._sync_jsonl(source)
+
+        if archive_dir.exists():
+            for archive in sorted(archive_dir.iterdir()):
+                added += self._sync_archive(archive)
+
+        return added
+
+    def _get_state(self, source: str) -> tuple:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT offset, identity FROM ingest_state WHERE source = ?", (source,)
+            ).fetchone()
+        return (row[0], row[1]) if row else (0, None)
+
+    def _get_offset(self, source: str) -> int:
+        return self._get_state(source)[0]
+
+    def _set_offset(self, source: str, offset: int, identity: str | None = None) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ingest_state (source, offset, identity) VALUES (?, ?, ?)",
+                (source, offset, identity),
+            )
+
+    @staticmethod
+    def _identity(f, stat: os.stat_result) -> str:
+        # Inode numbers can be reused once a compacted segment is deleted,
+        # so the first complete line is part of the identity too
+        f.seek(0)
+        first = f.readline()
+        first = first if first.endswith(b"\n") else b""
+        return f"{stat.st_dev}:{stat.st_ino}:{hashlib.sha1(first).hexdigest()[:16]}"
+
+    def _sync_jsonl(self, path: Path) -> int:
+        offset, known_identity = self._get_state(str(path))
+
+        entries = []
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            identity = self._identity(f, stat)
+
+            if identity != known_identity or stat.st_size < offset:
+                # Rotated and recreated (or truncated): read from the start;
+                # content hashes dedupe any overlap
+                if offset:
+                    self._stats["offset_resets"] += 1
+                offset = 0
+
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partial line still being written
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(loads(line))
+                except ValueError as e:
+                    self._stats["skipped_lines"] += 1
+                    print(f"Feedback index skipped an unreadable line in {path} at byte {offset - len(line)}: {e}")
+
+        added = self.add(entries)
+        self._set_offset(str(path), offset, identity)
+        return added
+
+    def _sync_archive(self, path: Path) -> int:
+        # Archives are immutable: ingest once
+        if self._get_offset(str(path)) < 0:
+            return 0
+
+        if path.suffix == ".parquet":
+            import pyarrow.parquet as pq
+            rows = pq.read_table(path).to_pylist()
+        elif path.name.endswith(".jsonl.gz"):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                rows = [loads(line) for line in f if line.strip()]
+        else:
+            return 0
+
+        added = self._add_rows(rows)
+        self._set_offset(str(path), -1)
+        return added
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+    def query(
+        self,
+        since: str | None = None,
+        until: str | None = None,
+        overall_status: str | None = None,
+        driver: str | None = None,
+        human_override: bool | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Dict]:
+        """
+        Time-range scan with optional filters, newest first.
+        `since` / `until` are ISO timestamps or dates (inclusive bounds).
+        """
+
+        clauses, params = [], []
+        if since:
+            clauses.append("f.ts >= ?")
+            params.append(since)
+        if until:
+            clauses.append("f.ts <= ?")
+            # A bare date covers that whole day
+            params.append(until + "T99" if len(until) == 10 else until)
+        if overall_status:
+            clauses.append("f.overall_status = ?")
+            params.append(overall_status)
+        if human_override is not None:
+            clauses.append("f.human_override = ?")
+            params.append(int(human_override))
+        if driver:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM feedback_drivers d "
+                "WHERE d.entry_id = f.entry_id AND d.driver = ?)"
+            )
+            params.append(driver)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT f.raw FROM feedback f {where} "
+                f"ORDER BY f.ts DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+
+        return [loads(r[0]) for r in rows]
+
+    def status_by_day(self, since: str | None = None, until: str | None = None) -> Dict:
+        """
+        {day: {overall_status: count}} from the rollup table.
+        """
+
+        clauses, params = [], []
+        if since:
+            clauses.append("day >= ?")
+            params.append(since[:10])
+        if until:
+            clauses.append("day <= ?")
+            params.append(until[:10])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT day, overall_status, n FROM rollup_status_day {where} "
+                f"ORDER BY day",
+                params,
+            ).fetchall()
+
+        result: Dict[str, Dict[str, int]] = {}
+        for day, status, n in rows:
+            result.setdefault(day, {})[status] = n
+        return result
+
+    def override_rate_by_driver(
+        self, since: str | None = None, until: str | None = None
+    ) -> Dict:
+        """
+        {driver: {total, overrides, override_rate}}.
+        Unbounded queries read the rollup; time ranges use the driver index.
+        """
+
+        with self._connect() as conn:
+            if not since and not until:
+                rows = conn.execute(
+                    "SELECT driver, total, overrides FROM rollup_driver"
+                ).fetchall()
+            else:
+                clauses, params = [], []
+                if since:
+                    clauses.append("ts >= ?")
+                    params.append(since)
+                if until:
+                    clauses.append("ts <= ?")
+                    params.append(until + "T99" if len(until) == 10 else until)
+                rows = conn.execute(
+                    f"SELECT driver, COUNT(*), SUM(human_override) "
+                    f"FROM feedback_drivers WHERE {' AND '.join(clauses)} "
+                    f"GROUP BY driver",
+                    params,
+                ).fetchall()
+
+        return {
+            driver: {
+                "total": total,
+                "overrides": overrides,
+                "override_rate": round(overrides / total, 4) if total else 0.0,
+            }
+            for driver, total, overrides in rows
+        }
+
+    def stats(self) -> Dict:
+        with self._connect() as conn:
+            (count,) = conn.execute("SELECT COUNT(*) FROM feedback").fetchone()
+        return {"records": count, "path": self.path, **self._stats}
+
+
+# Process-wide index, kept current by the feedback writer
+FEEDBACK_INDEX = FeedbackIndex()
+FEEDBACK_WRITER.add_listener(FEEDBACK_INDEX.add)
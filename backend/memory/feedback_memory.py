@@ -1,16 +1,315 @@
-import json
+import atexit
+import gzip
+import os
+import queue
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict
+from typing import Callable, Dict, List
+
+from backend.utils.serialization import dumps, loads
 
 MEMORY_PATH = Path("backend/memory/feedback_memory.jsonl")
 MEMORY_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+# Rotated segments and compacted archives live next to the active file
+SEGMENT_DIR = MEMORY_PATH.parent / "feedback_segments"
+ARCHIVE_DIR = MEMORY_PATH.parent / "feedback_archive"
+
+# Batching
+FEEDBACK_FLUSH_RECORDS = int(os.getenv("FEEDBACK_FLUSH_RECORDS", "64"))
+FEEDBACK_FLUSH_SECONDS = float(os.getenv("FEEDBACK_FLUSH_SECONDS", "1.0"))
+FEEDBACK_FSYNC = os.getenv("FEEDBACK_FSYNC", "0") == "1"
+
+# Rotation: by size, and whenever the UTC date changes
+FEEDBACK_SEGMENT_MAX_MB = float(os.getenv("FEEDBACK_SEGMENT_MAX_MB", "16"))
+
+# Compaction: rotated segments beyond the newest N are archived
+FEEDBACK_KEEP_SEGMENTS = int(os.getenv("FEEDBACK_KEEP_SEGMENTS", "4"))
+
+# Failed writes are retried with exponential backoff (seconds)
+FEEDBACK_RETRY_SECONDS = float(os.getenv("FEEDBACK_RETRY_SECONDS", "0.5"))
+FEEDBACK_RETRY_MAX_SECONDS = float(os.getenv("FEEDBACK_RETRY_MAX_SECONDS", "30"))
+
+
+def _parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def flatten_feedback(entry: Dict) -> Dict:
+    """
+    One flat row per feedback record (columnar archive / index layout).
+    """
+
+    feedback = entry.get("feedback", {}) or {}
+    snapshot = feedback.get("final_decision_snapshot", {}) or {}
+    drivers = snapshot.get("primary_driver") or []
+    drivers = drivers if isinstance(drivers, list) else [drivers]
+
+    return {
+        "timestamp": entry.get("timestamp"),
+        "overall_status": snapshot.get("overall_status"),
+        "attention_required": snapshot.get("attention_required"),
+        "primary_driver": ",".join(str(d) for d in drivers),
+        "confidence": snapshot.get("confidence"),
+        "human_override": feedback.get("human_override") is not None,
+        "raw": dumps(entry).decode("utf-8"),
+    }
+
+
+class FeedbackWriter:
+    """
+    Feedback Memory Writer
+    ----------------------
+    Append-only, off the request path.
+
+    - save() only enqueues; a daemon thread does the I/O
+    - Records are flushed in batches (by count or interval), optional fsync
+    - The active segment rotates by size or UTC date
+    - Old segments are compacted into a compressed columnar archive
+      (Parquet/zstd when pyarrow is installed, else gzip JSONL)
+    - A failed write keeps its batch and is retried with backoff (a
+      partial append is truncated first); flush() waiters are released
+      only once their records are on disk. A writer thread that died is
+      restarted by the next save() / flush() with its pending batch
+    """
+
+    def __init__(
+        self,
+        path: Path = MEMORY_PATH,
+        flush_records: int = FEEDBACK_FLUSH_RECORDS,
+        flush_seconds: float = FEEDBACK_FLUSH_SECONDS,
+        fsync: bool = FEEDBACK_FSYNC,
+        segment_max_mb: float = FEEDBACK_SEGMENT_MAX_MB,
+        keep_segments: int = FEEDBACK_KEEP_SEGMENTS,
+        retry_seconds: float = FEEDBACK_RETRY_SECONDS,
+        retry_max_seconds: float = FEEDBACK_RETRY_MAX_SECONDS,
+    ):
+        self.path = Path(path)
+        self.segment_dir = self.path.parent / SEGMENT_DIR.name
+        self.archive_dir = self.path.parent / ARCHIVE_DIR.name
+        self.flush_records = flush_records
+        self.flush_seconds = flush_seconds
+        self.fsync = fsync
+        self.segment_max_bytes = int(segment_max_mb * 1024 * 1024)
+        self.keep_segments = keep_segments
+        self.retry_seconds = retry_seconds
+        self.retry_max_seconds = retry_max_seconds
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._listeners: List[Callable[[List[Dict]], None]] = []
+        self._thread = None
+        self._start_lock = threading.Lock()
+        # Owned by the writer thread; kept on the instance so a restarted
+        # thread resumes the records (and flush waiters) not yet on disk
+        self._batch: List[Dict] = []
+        self._waiters: List[threading.Event] = []
+        self._stats = {
+            "enqueued": 0, "written": 0, "flushes": 0, "rotations": 0, "compactions": 0,
+            "write_errors": 0, "compaction_errors": 0, "restarts": 0,
+        }
+
+    # --------------------------------------------------
+    # Public API
+    # --------------------------------------------------
+    def add_listener(self, listener: Callable[[List[Dict]], None]) -> None:
+        """
+        Called on the writer thread with every batch after it is on disk
+        (e.g. to keep the feedback index current).
+        """
+        self._listeners.append(listener)
+
+    def save(self, entry: Dict) -> None:
+        self._ensure_started()
+        self._stats["enqueued"] += 1
+        self._queue.put(entry)
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """
+        Blocks until everything enqueued so far is on disk.
+        Returns False if that did not happen within `timeout`.
+        """
+        if self._thread is None and self._queue.empty() and not self._batch:
+            return True
+        self._ensure_started()
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+        self._thread = None
+
+    def stats(self) -> Dict:
+        return {
+            **self._stats,
+            "pending": self._queue.qsize() + len(self._batch),
+            "alive": self._thread is not None and self._thread.is_alive(),
+        }
+
+    # --------------------------------------------------
+    # Writer thread
+    # --------------------------------------------------
+    def _ensure_started(self) -> None:
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            with self._start_lock:
+                thread = self._thread
+                if thread is None or not thread.is_alive():
+                    if thread is not None:
+                        self._stats["restarts"] += 1
+                        print("Feedback writer thread was not running; restarting")
+                    self._thread = threading.Thread(
+                        target=self._run, name="feedback-writer", daemon=True
+                    )
+                    self._thread.start()
+
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.flush_seconds
+        failures = 0
+
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = False
+
+            if isinstance(item, dict):
+                self._batch.append(item)
+                if len(self._batch) < self.flush_records or (failures and time.monotonic() < deadline):
+                    continue
+            elif isinstance(item, threading.Event):
+                self._waiters.append(item)
+
+            # Size / interval reached, flush requested, retry due, or shutting down
+            if self._batch:
+                try:
+                    self._write(self._batch)
+                except Exception as e:
+                    failures += 1
+                    self._stats["write_errors"] += 1
+                    delay = min(self.retry_seconds * 2 ** (failures - 1), self.retry_max_seconds)
+                    print(f"Feedback write failed ({len(self._batch)} records kept, retry in {delay:.1f}s): {e}")
+
+                    if item is None:
+                        # Shutting down: nothing left to retry on
+                        return
+                    deadline = time.monotonic() + delay
+                    continue
+
+                failures = 0
+                self._batch = []
+
+            deadline = time.monotonic() + self.flush_seconds
+
+            for waiter in self._waiters:
+                waiter.set()
+            self._waiters = []
+
+            if item is None:
+                return
+
+    def _write(self, batch: List[Dict]) -> None:
+        timestamp = str(batch[0].get("timestamp") or datetime.utcnow().isoformat())
+        self._maybe_rotate(timestamp[:10])
+
+        data = b"".join(dumps(entry) + b"\n" for entry in batch)
+        start = self.path.stat().st_size if self.path.exists() else 0
+        try:
+            with open(self.path, "ab") as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+        except Exception:
+            # Drop a partial append so the retry does not duplicate records
+            try:
+                if self.path.exists() and self.path.stat().st_size > start:
+                    os.truncate(self.path, start)
+            except OSError:
+                pass
+            raise
+
+        self._stats["written"] += len(batch)
+        self._stats["flushes"] += 1
+
+        for listener in self._listeners:
+            try:
+                listener(batch)
+            except Exception as e:
+                # Derived data only; the append-only log stays authoritative
+                print(f"Feedback listener failed: {e}")
+
+    # --------------------------------------------------
+    # Rotation & Compaction
+    # --------------------------------------------------
+    def _maybe_rotate(self, batch_date: str) -> None:
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return
+
+        stat = self.path.stat()
+        active_date = datetime.utcfromtimestamp(stat.st_mtime).date().isoformat()
+
+        if stat.st_size < self.segment_max_bytes and active_date == batch_date:
+            return
+
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        os.replace(self.path, self.segment_dir / f"feedback-{active_date}-{stamp}.jsonl")
+        self._stats["rotations"] += 1
+
+        try:
+            self._compact()
+        except Exception as e:
+            # Housekeeping only: segments stay on disk and are retried next rotation
+            self._stats["compaction_errors"] += 1
+            print(f"Feedback compaction failed: {e}")
+
+    def _compact(self) -> None:
+        segments = sorted(self.segment_dir.glob("feedback-*.jsonl"))
+        stale = segments[: max(0, len(segments) - self.keep_segments)]
+
+        for segment in stale:
+            with open(segment, "r", encoding="utf-8") as f:
+                rows = [flatten_feedback(loads(line)) for line in f if line.strip()]
+
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            target = self.archive_dir / segment.stem
+
+            if _parquet_available():
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                tmp = target.with_suffix(".parquet.tmp")
+                pq.write_table(pa.Table.from_pylist(rows), tmp, compression="zstd")
+                os.replace(tmp, target.with_suffix(".parquet"))
+            else:
+                tmp = target.with_suffix(".jsonl.gz.tmp")
+                with gzip.open(tmp, "wb") as f:
+                    f.writelines(dumps(row) + b"\n" for row in rows)
+                os.replace(tmp, target.with_suffix(".jsonl.gz"))
+
+            segment.unlink()
+            self._stats["compactions"] += 1
+
+
+# Process-wide writer; flushed on interpreter exit
+FEEDBACK_WRITER = FeedbackWriter()
+atexit.register(FEEDBACK_WRITER.close)
+
 
 def save_feedback_memory(record: Dict):
     """
     Append feedback memory safely.
-    Immutable, append-only.
+    Immutable, append-only. Buffered: returns before the write hits disk.
     """
 
     memory_entry = {
@@ -18,5 +317,4 @@ def save_feedback_memory(record: Dict):
         "feedback": record
     }
 
-    with open(MEMORY_PATH, "a", encoding="utf-8") as f:
-        f.write(json.dumps(memory_entry) + "\n")
+    FEEDBACK_WRITER.save(memory_entry)
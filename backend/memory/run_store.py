@@ -0,0 +1,239 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from typing import Dict, List
+
+from backend.utils.serialization import dumps, loads
+
+RUN_STORE_PATH = os.getenv("RUN_STORE_PATH", "backend/memory/run_results.sqlite3")
+
+# Retention: whichever limit is hit first evicts the oldest runs
+RUN_STORE_MAX_RUNS = int(os.getenv("RUN_STORE_MAX_RUNS", "1000"))
+RUN_STORE_MAX_AGE_DAYS = float(os.getenv("RUN_STORE_MAX_AGE_DAYS", "30"))
+RUN_STORE_MAX_MB = float(os.getenv("RUN_STORE_MAX_MB", "256"))
+
+
+def _load_zstd():
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+_ZSTD = _load_zstd()
+
+
+def _compress(data: bytes) -> tuple:
+    if _ZSTD is not None:
+        return "zstd", _ZSTD.ZstdCompressor(level=3).compress(data)
+    return "zlib", zlib.compress(data, 6)
+
+
+def _decompress(encoding: str, blob: bytes) -> bytes:
+    if encoding == "zstd":
+        if _ZSTD is None:
+            raise RuntimeError("zstandard is required to read this run")
+        return _ZSTD.ZstdDecompressor().decompress(blob)
+    if encoding == "zlib":
+        return zlib.decompress(blob)
+    return blob
+
+
+class RunStore:
+    """
+    Run Result Store
+    ----------------
+    SQLite table of full graph results, one row per run.
+
+    - Unique run IDs (no same-second overwrites)
+    - Payloads compressed (zstd when installed, else zlib)
+    - Indexed by run ID, session ID and creation time
+    - Retention by count, age and total compressed size
+    """
+
+    def __init__(
+        self,
+        path: str = RUN_STORE_PATH,
+        max_runs: int = RUN_STORE_MAX_RUNS,
+        max_age_days: float = RUN_STORE_MAX_AGE_DAYS,
+        max_mb: float = RUN_STORE_MAX_MB,
+    ):
+        self.path = path
+        self.max_runs = max_runs
+        self.max_age_seconds = max_age_days * 86400
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            # Must precede table creation to take effect on a new file
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    session_id TEXT,
+                    query TEXT,
+                    created_at REAL NOT NULL,
+                    encoding TEXT NOT NULL,
+                    raw_bytes INTEGER NOT NULL,
+                    stored_bytes INTEGER NOT NULL,
+                    payload BLOB NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_runs_created ON runs (created_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_runs_session ON runs (session_id, created_at)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    # --------------------------------------------------
+    # Writes
+    # --------------------------------------------------
+    def put(self, result: Dict, run_id: str | None = None) -> str:
+        run_id = run_id or uuid.uuid4().hex
+        raw = dumps(result)
+        encoding, blob = _compress(raw)
+
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO runs (run_id, session_id, query, created_at, encoding, "
+                "raw_bytes, stored_bytes, payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    result.get("session_id"),
+                    result.get("query"),
+                    time.time(),
+                    encoding,
+                    len(raw),
+                    len(blob),
+                    blob,
+                ),
+            )
+            self._evict(conn)
+
+        return run_id
+
+    def _evict(self, conn) -> None:
+        evicted = conn.execute(
+            "DELETE FROM runs WHERE created_at < ?",
+            (time.time() - self.max_age_seconds,),
+        ).rowcount
+
+        evicted += conn.execute(
+            """
+            DELETE FROM runs WHERE run_id IN (
+                SELECT run_id FROM runs ORDER BY created_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_runs,),
+        ).rowcount
+
+        # Size budget: drop oldest runs until the running total fits
+        evicted += conn.execute(
+            """
+            DELETE FROM runs WHERE run_id IN (
+                SELECT run_id FROM (
+                    SELECT run_id,
+                           SUM(stored_bytes) OVER (ORDER BY created_at DESC) AS total
+                    FROM runs
+                ) WHERE total > ?
+            )
+            """,
+            (self.max_bytes,),
+        ).rowcount
+
+        if evicted:
+            conn.execute("PRAGMA incremental_vacuum")
+
+    # --------------------------------------------------
+    # Reads
+    # --------------------------------------------------
+    def get(self, run_id: str) -> Dict | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT encoding, payload FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return loads(_decompress(row[0], row[1]))
+
+    def exists(self, run_id: str) -> bool:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return row is not None
+
+    def list(
+        self,
+        session_id: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int = 50,
+    ) -> List[Dict]:
+        """
+        Run metadata (no payloads), newest first.
+        """
+
+        clauses, params = [], []
+        if session_id is not None:
+            clauses.append("session_id = ?")
+            params.append(session_id)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at <= ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT run_id, session_id, query, created_at, encoding, "
+                f"raw_bytes, stored_bytes FROM runs {where} "
+                f"ORDER BY created_at DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+
+        columns = [
+            "run_id", "session_id", "query", "created_at",
+            "encoding", "raw_bytes", "stored_bytes",
+        ]
+        return [dict(zip(columns, row)) for row in rows]
+
+    def stats(self) -> Dict:
+        with self._connect() as conn:
+            count, raw, stored = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(raw_bytes), 0), "
+                "COALESCE(SUM(stored_bytes), 0) FROM runs"
+            ).fetchone()
+
+        return {
+            "runs": count,
+            "raw_bytes": raw,
+            "stored_bytes": stored,
+            "max_runs": self.max_runs,
+            "max_bytes": self.max_bytes,
+            "max_age_seconds": self.max_age_seconds,
+        }
+
+
+# Process-wide store used by the API
+RUN_STORE = RunStore()
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Tuple
+
+from backend.agents.intent_rules import INTENT_ENGINE
+from backend.intelligence.feature_store import FEATURE_STORE, FEATURE_VERSION
+
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "256"))
+ANSWER_CACHE_TTL_SECONDS = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "300"))
+
+# "intent": queries that parse to the same intent share an answer
+# "query": only identical normalized query text does
+ANSWER_CACHE_KEY = os.getenv("ANSWER_CACHE_KEY", "intent")
+
+# Bump when agent / graph logic changes answers for the same data
+PIPELINE_VERSION = "1"
+
+
+class AnswerCache:
+    """
+    Answer Cache
+    ------------
+    Caches /api/ask summaries so a repeated question skips the graph and
+    the LLM call entirely.
+
+    - Key = parsed intent (or normalized query) + graph variant +
+      dataset fingerprint + pipeline / feature / rules versions, so new
+      data or new logic never serves a stale answer
+    - Single-flight: concurrent identical requests share one execution
+    - LRU in memory, every entry expires after `ttl_seconds`
+    """
+
+    def __init__(
+        self,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = ANSWER_CACHE_TTL_SECONDS,
+        key_mode: str = ANSWER_CACHE_KEY,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.key_mode = key_mode
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0, "uncacheable": 0}
+
+    # --------------------------------------------------
+    # Keys
+    # --------------------------------------------------
+    def key(self, query: str, variant: str) -> str:
+        if self.key_mode == "query":
+            subject = {"query": " ".join(query.lower().split())}
+        else:
+            subject = {"intent": INTENT_ENGINE.parse(query)}
+
+        canonical = json.dumps(
+            {
+                **subject,
+                "variant": variant,
+                "data": FEATURE_STORE.fingerprint(),
+                "pipeline": PIPELINE_VERSION,
+                "features": FEATURE_VERSION,
+                "rules": INTENT_ENGINE.version,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    # --------------------------------------------------
+    # Lookup / single-flight
+    # --------------------------------------------------
+    def get_or_compute(self, key: str, compute: Callable[[], Tuple[Dict, bool]]) -> Tuple[Dict, str]:
+        """
+        Returns (answer, "hit" | "miss" | "coalesced").
+        `compute` returns (answer, cacheable); uncacheable answers (e.g.
+        LLM fallbacks) still reach coalesced waiters but are not stored.
+        """
+
+        with self._lock:
+            answer = self._lookup(key)
+            if answer is not None:
+                return answer, "hit"
+
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            return future.result(), "coalesced"
+
+        try:
+            answer, cacheable = compute()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            if cacheable:
+                self._store(key, answer)
+            else:
+                self._stats["uncacheable"] += 1
+
+        future.set_result(answer)
+        return answer, "miss"
+
+    def peek(self, key: str) -> Dict | None:
+        with self._lock:
+            return self._lookup(key)
+
+    def put(self, key: str, answer: Dict) -> None:
+        with self._lock:
+            self._store(key, answer)
+
+    # Both helpers expect self._lock to be held
+    def _lookup(self, key: str) -> Dict | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, answer = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return answer
+
+    def _store(self, key: str, answer: Dict) -> None:
+        self._entries[key] = (time.monotonic(), answer)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "inflight": len(self._inflight),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "key_mode": self.key_mode,
+            }
+
+
+# Process-wide cache used by the ask routes
+ANSWER_CACHE = AnswerCache()
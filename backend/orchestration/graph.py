@@ -1,9 +1,15 @@
 from langgraph.graph import StateGraph
-import numpy as np
+import time
 
 from backend.orchestration.state import AgentState
-from backend.intelligence.feature_builder import build_features
-
+from backend.orchestration.registry import GraphRegistry
+from backend.orchestration.routing import plan_route, ROUTING_STATS
+from backend.orchestration.tracing import TRACER
+from backend.intelligence.feature_store import FEATURE_STORE
+from backend.utils.serialization import records
+
+from backend.agents.query_understanding_agent import query_understanding_agent
+from backend.agents.segment_agent import segment_agent_node
 from backend.agents.ops_agent import ops_agent_node
 from backend.agents.finance_agent import finance_agent_node
 from backend.agents.cx_agent import cx_agent_node
@@ -12,44 +18,19 @@ from backend.agents.action_explainability_agent import action_explainability_age
 from backend.agents.evaluation_agent import evaluation_agent_node
 from backend.agents.feedback_agent import feedback_agent_node
 from backend.agents.synthesis_agent import synthesis_agent_node
+from backend.agents.strategy_agent import strategy_agent_node
 from backend.agents.llm_explainer_agent import llm_explainer_agent_node
 
 
 # --------------------------------------------------
-# Feature Engineering + Prioritization (UNCHANGED)
+# Feature Engineering + Prioritization
 # --------------------------------------------------
 def feature_engineering_node(state: AgentState):
-    result = build_features()
-
-    if isinstance(result, tuple) and len(result) == 2:
-        features_df, risk_state = result
-    elif isinstance(result, tuple) and len(result) == 3:
-        features_df, risk_state, _ = result
-    else:
-        raise ValueError("Unexpected return from build_features()")
-
-    if "customer_risk_score" not in features_df.columns:
-        features_df["customer_risk_score"] = (
-            0.35 * features_df["usage_volatility"].fillna(0)
-            + 0.30 * features_df["ops_stress"].fillna(0)
-            + 0.25 * features_df["financial_stress"].fillna(0) / 10000
-            + 0.10 * features_df["cx_stress"].fillna(0)
-        )
-
-    features_df["customer_risk_score"] = (
-        features_df["customer_risk_score"]
-        .replace([np.inf, -np.inf], 0)
-        .fillna(0)
-        .astype(float)
-    )
-
-    prioritized_df = (
-        features_df
-        .sort_values("customer_risk_score", ascending=False)
-        .head(10)
-    )
+    # Served from the feature store; when the dataset changes only the
+    # changed rows are recomputed and the top-10 is merged from that delta
+    prioritized_df, risk_state = FEATURE_STORE.top(10)
 
-    top_customers = prioritized_df.to_dict(orient="records")
+    top_customers = records(prioritized_df)
 
     state["engineered_signals"] = top_customers
     state["top_customers"] = top_customers
@@ -62,55 +43,213 @@ def feature_engineering_node(state: AgentState):
 
 
 # --------------------------------------------------
-# Graph Builder (FIXED ORDER ONLY)
+# Strategy (full customer table)
 # --------------------------------------------------
-def build_agentic_graph():
+def strategy_node(state: AgentState):
+    # The state never carries the full frame; read the shared store copy
+    features_df, _ = FEATURE_STORE.view()
+    return strategy_agent_node(state, features_df=features_df)
+
+
+# --------------------------------------------------
+# Query Understanding + Plan
+# --------------------------------------------------
+def query_understanding_node(include_llm: bool = True):
+    def run(state: AgentState):
+        update = query_understanding_agent(state)
+        update["plan"] = plan_route(update["intent"], include_llm)
+        return update
+
+    return run
+
+
+def route_after_query(state: AgentState) -> str:
+    return state["plan"]["route"]
+
+
+def route_after_strategy(state: AgentState) -> str:
+    return "llm_explainer" if state["plan"]["llm"] else "feedback"
+
+
+# --------------------------------------------------
+# Per-node latency & tracing
+# --------------------------------------------------
+def timed_node(name: str, node, tracer=TRACER):
+    """
+    Wraps a node so its wall time lands in agent_latency_ms[name]
+    (and, unless tracing is off, its full trace record in trace[name]).
+    """
+
+    node = tracer.wrap(name, node)
+
+    def run(state):
+        started = time.perf_counter()
+        update = node(state) or {}
+        update["agent_latency_ms"] = {
+            name: round((time.perf_counter() - started) * 1000, 3)
+        }
+        return update
+
+    return run
+
+
+# Independent agents: read engineered_signals / risk_state only,
+# each writes its own agent_outputs key
+PARALLEL_AGENTS = {
+    "operations": ops_agent_node,
+    "finance": finance_agent_node,
+    "cx": cx_agent_node,
+    "data_validation": data_validation_agent_node,
+}
+
+
+# --------------------------------------------------
+# Graph Builder (ROUTE → FAN-OUT → JOIN → FIXED ORDER)
+# --------------------------------------------------
+def build_agentic_graph(include_llm: bool = True, routing: bool = True):
+    """
+    With routing, query understanding runs first and its plan picks the
+    path: segmented analysis, or the agent pipeline with or without the
+    LLM explainer. Without routing every query runs every agent.
+    """
+
     graph = StateGraph(AgentState)
 
-    graph.add_node("feature_engineering", feature_engineering_node)
-    graph.add_node("operations", ops_agent_node)
-    graph.add_node("finance", finance_agent_node)
-    graph.add_node("cx", cx_agent_node)
-    graph.add_node("data_validation", data_validation_agent_node)
-    graph.add_node("action_explainability", action_explainability_agent_node)
-    graph.add_node("evaluation", evaluation_agent_node)
+    def add(name, node):
+        graph.add_node(name, timed_node(name, node))
+
+    if routing:
+        add("query_understanding", query_understanding_node(include_llm))
+        add("segment_analysis", segment_agent_node)
+
+    add("feature_engineering", feature_engineering_node)
+
+    for name, node in PARALLEL_AGENTS.items():
+        add(name, node)
+
+    add("action_explainability", action_explainability_agent_node)
+    add("evaluation", evaluation_agent_node)
 
     # 🔑 FINAL DECISION CREATED HERE
-    graph.add_node("synthesis", synthesis_agent_node)
+    add("synthesis", synthesis_agent_node)
+    add("strategy", strategy_node)
 
     # 🔑 READ-ONLY
-    graph.add_node("llm_explainer", llm_explainer_agent_node)
+    if include_llm:
+        add("llm_explainer", llm_explainer_agent_node)
 
     # 🔑 SNAPSHOT LAST
-    graph.add_node("feedback", feedback_agent_node)
+    add("feedback", feedback_agent_node)
+
+    if routing:
+        graph.set_entry_point("query_understanding")
+        graph.add_conditional_edges(
+            "query_understanding",
+            route_after_query,
+            {"segments": "segment_analysis", "agents": "feature_engineering"},
+        )
+        graph.add_edge("segment_analysis", "feedback")
+    else:
+        graph.set_entry_point("feature_engineering")
 
-    graph.set_entry_point("feature_engineering")
+    # Fan-out: independent agents run in the same superstep
+    for name in PARALLEL_AGENTS:
+        graph.add_edge("feature_engineering", name)
 
-    graph.add_edge("feature_engineering", "operations")
-    graph.add_edge("operations", "finance")
-    graph.add_edge("finance", "cx")
-    graph.add_edge("cx", "data_validation")
-    graph.add_edge("data_validation", "action_explainability")
+    # Join: waits for every parallel branch before acting
+    graph.add_edge(list(PARALLEL_AGENTS), "action_explainability")
     graph.add_edge("action_explainability", "evaluation")
 
     graph.add_edge("evaluation", "synthesis")
-    graph.add_edge("synthesis", "llm_explainer")
-    graph.add_edge("llm_explainer", "feedback")
+    graph.add_edge("synthesis", "strategy")
+    if include_llm and routing:
+        graph.add_conditional_edges(
+            "strategy",
+            route_after_strategy,
+            {"llm_explainer": "llm_explainer", "feedback": "feedback"},
+        )
+        graph.add_edge("llm_explainer", "feedback")
+    elif include_llm:
+        graph.add_edge("strategy", "llm_explainer")
+        graph.add_edge("llm_explainer", "feedback")
+    else:
+        graph.add_edge("strategy", "feedback")
 
     return graph.compile()
 
 
 # --------------------------------------------------
-# Runner (UNCHANGED)
+# Compiled Graph Registry (BUILT ONCE PER PROCESS)
 # --------------------------------------------------
-def run_agentic_graph(query: str, session_id: str = None):
-    app = build_agentic_graph()
+GRAPH_REGISTRY = GraphRegistry()
+GRAPH_REGISTRY.register("full", build_agentic_graph)
+GRAPH_REGISTRY.register("no_llm", lambda: build_agentic_graph(include_llm=False))
+# Every agent for every query (baseline for routing savings)
+GRAPH_REGISTRY.register("unrouted", lambda: build_agentic_graph(routing=False))
+
 
-    state = {
+# --------------------------------------------------
+# Runners
+# --------------------------------------------------
+def _initial_state(
+    query: str, session_id: str = None, bypass_llm_cache: bool = False
+) -> dict:
+    return {
         "query": query,
         "session_id": session_id,
+        "bypass_llm_cache": bypass_llm_cache,
         "agent_outputs": {},
         "final_decision": {},
     }
 
-    return app.invoke(state)
+
+def run_agentic_graph(
+    query: str,
+    session_id: str = None,
+    variant: str = "full",
+    bypass_llm_cache: bool = False,
+):
+    app = GRAPH_REGISTRY.get(variant)
+
+    started = time.perf_counter()
+    result = app.invoke(_initial_state(query, session_id, bypass_llm_cache))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    ROUTING_STATS.record(result, elapsed_ms)
+    TRACER.record_run(variant, elapsed_ms)
+
+    return result
+
+
+def stream_agentic_graph(
+    query: str,
+    session_id: str = None,
+    variant: str = "full",
+    bypass_llm_cache: bool = False,
+):
+    """
+    Yields ("node", name, update, elapsed_ms) as each node finishes,
+    then ("final", None, final_state, elapsed_ms) once the graph ends.
+    """
+
+    app = GRAPH_REGISTRY.get(variant)
+    started = time.perf_counter()
+    final_state = None
+
+    for mode, chunk in app.stream(
+        _initial_state(query, session_id, bypass_llm_cache),
+        stream_mode=["updates", "values"],
+    ):
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+
+        if mode == "values":
+            final_state = chunk
+            continue
+
+        for name, update in chunk.items():
+            yield "node", name, update, elapsed_ms
+
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+    ROUTING_STATS.record(final_state or {}, elapsed_ms)
+    TRACER.record_run(variant, elapsed_ms)
+
+    yield "final", None, final_state, elapsed_ms
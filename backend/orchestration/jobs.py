@@ -0,0 +1,242 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from backend.utils.serialization import dumps, loads
+
+# Concurrent graph runs allowed across the process
+JOB_MAX_CONCURRENCY = int(os.getenv("JOB_MAX_CONCURRENCY", "2"))
+
+# Jobs allowed to wait behind the running ones before we push back (429)
+JOB_MAX_QUEUE = int(os.getenv("JOB_MAX_QUEUE", "16"))
+
+# Finished jobs kept for status polling
+JOB_RETENTION = int(os.getenv("JOB_RETENTION", "500"))
+
+# Optional SQLite job store (e.g. "backend/memory/jobs.sqlite3")
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH")
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at capacity."""
+
+
+# --------------------------------------------------
+# Job Stores
+# --------------------------------------------------
+class MemoryJobStore:
+    """
+    In-process job records, oldest finished jobs evicted first.
+    """
+
+    def __init__(self, retention: int = JOB_RETENTION):
+        self.retention = retention
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, job: Dict) -> None:
+        with self._lock:
+            self._jobs[job["job_id"]] = dict(job)
+            self._evict()
+
+    def get(self, job_id: str) -> Dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list(self, limit: int = 50) -> List[Dict]:
+        with self._lock:
+            jobs = list(self._jobs.values())[-limit:]
+        return [dict(j) for j in reversed(jobs)]
+
+    def _evict(self) -> None:
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job["status"] in {"succeeded", "failed"}
+        ]
+        for job_id in finished[: max(0, len(finished) - self.retention)]:
+            del self._jobs[job_id]
+
+
+class SQLiteJobStore:
+    """
+    Durable job records so status survives restarts and is visible
+    to every worker sharing the database file.
+    """
+
+    def __init__(self, path: str, retention: int = JOB_RETENTION):
+        self.path = path
+        self.retention = retention
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    submitted_at REAL NOT NULL,
+                    payload TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_submitted ON jobs (submitted_at)"
+            )
+            # Jobs from a previous process can no longer complete
+            for (job_id, payload) in conn.execute(
+                "SELECT job_id, payload FROM jobs WHERE status IN ('queued', 'running')"
+            ).fetchall():
+                job = loads(payload)
+                job.update({"status": "failed", "error": "Interrupted by restart"})
+                conn.execute(
+                    "UPDATE jobs SET status = ?, payload = ? WHERE job_id = ?",
+                    ("failed", dumps(job).decode("utf-8"), job_id),
+                )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def put(self, job: Dict) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, status, submitted_at, payload) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    job["job_id"],
+                    job["status"],
+                    job["submitted_at"],
+                    dumps(job).decode("utf-8"),
+                ),
+            )
+            conn.execute(
+                """
+                DELETE FROM jobs WHERE job_id IN (
+                    SELECT job_id FROM jobs
+                    WHERE status IN ('succeeded', 'failed')
+                    ORDER BY submitted_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.retention,),
+            )
+
+    def get(self, job_id: str) -> Dict | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return loads(row[0]) if row else None
+
+    def list(self, limit: int = 50) -> List[Dict]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT payload FROM jobs ORDER BY submitted_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [loads(r[0]) for r in rows]
+
+
+# --------------------------------------------------
+# Job Queue
+# --------------------------------------------------
+class JobQueue:
+    """
+    Bounded Job Queue
+    -----------------
+    Runs submitted work on a fixed-size thread pool.
+
+    - At most `max_concurrency` jobs execute at once
+    - At most `max_queue` further jobs wait; beyond that submit() raises
+      QueueFullError (surfaced as HTTP 429)
+    - Job records live in a MemoryJobStore or SQLiteJobStore
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = JOB_MAX_CONCURRENCY,
+        max_queue: int = JOB_MAX_QUEUE,
+        store=None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.store = store or (
+            SQLiteJobStore(JOB_STORE_PATH) if JOB_STORE_PATH else MemoryJobStore()
+        )
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="agentic-job"
+        )
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, *args, **meta) -> Dict:
+        with self._lock:
+            if self._in_flight >= self.max_concurrency + self.max_queue:
+                raise QueueFullError(
+                    f"Job queue full ({self._in_flight} jobs in flight)"
+                )
+            self._in_flight += 1
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "meta": meta,
+            "result": None,
+            "error": None,
+        }
+        self.store.put(job)
+
+        try:
+            self._executor.submit(self._run, job, fn, args)
+        except RuntimeError:
+            # Executor shut down between the capacity check and submit
+            with self._lock:
+                self._in_flight -= 1
+            raise
+
+        return job
+
+    def get(self, job_id: str) -> Dict | None:
+        return self.store.get(job_id)
+
+    def list(self, limit: int = 50) -> List[Dict]:
+        return self.store.list(limit)
+
+    def stats(self) -> Dict:
+        return {
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: Dict, fn: Callable, args: tuple) -> None:
+        job.update({"status": "running", "started_at": time.time()})
+        self.store.put(job)
+
+        try:
+            job["result"] = fn(*args)
+            job["status"] = "succeeded"
+        except Exception as e:
+            job["error"] = str(e)
+            job["status"] = "failed"
+        finally:
+            job["finished_at"] = time.time()
+            self.store.put(job)
+            with self._lock:
+                self._in_flight -= 1
+
+
+# Process-wide queue used by the API
+JOB_QUEUE = JobQueue()
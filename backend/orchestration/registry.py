@@ -0,0 +1,82 @@
+import threading
+import time
+from typing import Callable, Dict
+
+
+class GraphRegistry:
+    """
+    Compiled Graph Registry
+    -----------------------
+    Holds one compiled LangGraph app per named variant for the
+    lifetime of the process.
+
+    - Builders are registered by name (e.g. "full", "no_llm")
+    - Each variant is compiled at most once (double-checked lock)
+    - Compiled apps are immutable and shared by concurrent requests
+    - Tracks build time and reuse counts per variant
+    """
+
+    def __init__(self):
+        self._builders: Dict[str, Callable] = {}
+        self._compiled: Dict[str, object] = {}
+        self._stats: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, builder: Callable) -> None:
+        with self._lock:
+            self._builders[name] = builder
+            # Re-registering drops any stale compiled app
+            self._compiled.pop(name, None)
+            self._stats[name] = {
+                "compiled": False,
+                "build_seconds": None,
+                "built_at": None,
+                "uses": 0,
+            }
+
+    def variants(self) -> list:
+        return list(self._builders.keys())
+
+    def get(self, name: str = "full"):
+        app = self._compiled.get(name)
+
+        if app is None:
+            with self._lock:
+                app = self._compiled.get(name)
+                if app is None:
+                    app = self._build(name)
+
+        # Counter is advisory; a lost increment under contention is acceptable
+        self._stats[name]["uses"] += 1
+        return app
+
+    def warm(self, names: list | None = None) -> None:
+        """
+        Compile variants up-front (called at application startup).
+        """
+        for name in names or self.variants():
+            if name not in self._compiled:
+                with self._lock:
+                    if name not in self._compiled:
+                        self._build(name)
+
+    def stats(self) -> Dict[str, Dict]:
+        return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def _build(self, name: str):
+        # Caller must hold self._lock
+        builder = self._builders.get(name)
+        if builder is None:
+            raise KeyError(f"Unknown graph variant: {name}")
+
+        started = time.perf_counter()
+        app = builder()
+        elapsed = time.perf_counter() - started
+
+        self._compiled[name] = app
+        self._stats[name].update({
+            "compiled": True,
+            "build_seconds": round(elapsed, 4),
+            "built_at": time.time(),
+        })
+        return app
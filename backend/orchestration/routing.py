@@ -0,0 +1,118 @@
+import threading
+from typing import Dict
+
+# Nodes on each route, in execution order
+AGENT_ROUTE_NODES = [
+    "feature_engineering",
+    "operations",
+    "finance",
+    "cx",
+    "data_validation",
+    "action_explainability",
+    "evaluation",
+    "synthesis",
+    "strategy",
+    "llm_explainer",
+    "feedback",
+]
+SEGMENT_ROUTE_NODES = ["segment_analysis", "feedback"]
+
+# Intents whose answer is the ranked list itself (no narrative needed)
+NO_LLM_INTENTS = {"prioritization"}
+
+
+def plan_route(intent: Dict, include_llm: bool = True) -> Dict:
+    """
+    Execution plan for a parsed query
+    ---------------------------------
+    - region / city / location questions → segmented analysis only
+    - prioritization ("who / which / list") → agents without the LLM
+    - everything else → full agent pipeline (risk state always comes
+      from the feature store, the narrative from the LLM cache if warm)
+    """
+
+    intent = intent or {}
+
+    if intent.get("entity") == "region":
+        route, llm = "segments", False
+        nodes = SEGMENT_ROUTE_NODES
+    else:
+        route = "agents"
+        llm = include_llm and intent.get("intent") not in NO_LLM_INTENTS
+        nodes = [n for n in AGENT_ROUTE_NODES if llm or n != "llm_explainer"]
+
+    # Relative to the unrouted pipeline of this graph variant
+    baseline = [n for n in AGENT_ROUTE_NODES if include_llm or n != "llm_explainer"]
+
+    return {
+        "intent": intent.get("intent", "unknown"),
+        "entity": intent.get("entity", "general"),
+        "route": route,
+        "llm": llm,
+        "nodes": list(nodes),
+        "skipped": [n for n in baseline if n not in nodes],
+    }
+
+
+class RoutingStats:
+    """
+    Routing Stats
+    -------------
+    Per-intent plan counts and latency, plus the mean latency of every
+    node seen so far, so the time a route skips can be estimated from
+    what those nodes cost when they did run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._plans: Dict[str, Dict] = {}
+        self._nodes: Dict[str, Dict] = {}
+
+    def record(self, result: Dict, elapsed_ms: float) -> None:
+        plan = result.get("plan")
+        if not plan:
+            return
+
+        key = f"{plan['intent']}/{plan['entity']}"
+
+        with self._lock:
+            for node, ms in (result.get("agent_latency_ms") or {}).items():
+                entry = self._nodes.setdefault(node, {"runs": 0, "total_ms": 0.0})
+                entry["runs"] += 1
+                entry["total_ms"] += ms
+
+            entry = self._plans.setdefault(key, {
+                "route": plan["route"],
+                "llm": plan["llm"],
+                "skipped": plan["skipped"],
+                "runs": 0,
+                "total_ms": 0.0,
+            })
+            entry["runs"] += 1
+            entry["total_ms"] += elapsed_ms
+
+    def stats(self) -> Dict:
+        with self._lock:
+            node_mean = {
+                node: round(e["total_ms"] / e["runs"], 3)
+                for node, e in self._nodes.items()
+            }
+            plans = {}
+            for key, e in self._plans.items():
+                plans[key] = {
+                    "route": e["route"],
+                    "llm": e["llm"],
+                    "runs": e["runs"],
+                    "mean_ms": round(e["total_ms"] / e["runs"], 3),
+                    "skipped": e["skipped"],
+                    # Unknown until the skipped node has run at least once
+                    "estimated_saved_ms": round(
+                        sum(node_mean.get(n, 0.0) for n in e["skipped"]), 3
+                    ),
+                }
+
+        return {"plans": plans, "node_mean_ms": node_mean}
+
+
+# Process-wide routing stats (fed by the graph runners)
+ROUTING_STATS = RoutingStats()
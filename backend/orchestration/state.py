@@ -1,16 +1,41 @@
-from typing import TypedDict, Dict, List, Any
+from typing import Annotated, TypedDict, Dict, List, Any
+
+
+def merge_dicts(left: Dict | None, right: Dict | None) -> Dict:
+    """
+    Reducer for keyed agent outputs.
+    Parallel branches each write their own key; updates are merged,
+    never overwritten wholesale.
+    """
+    merged = dict(left or {})
+    merged.update(right or {})
+    return merged
 
 
 class AgentState(TypedDict, total=False):
     query: str
     session_id: str
 
+    # Per-request switch: skip the LLM response cache
+    bypass_llm_cache: bool
+
+    # Parsed query and the execution plan routed from it
+    intent: Dict
+    plan: Dict
+
     engineered_signals: List[Dict]
     top_customers: List[Dict]
     risk_state: Dict
     features_df: Dict | None
 
-    agent_outputs: Dict[str, Any]
+    # ✅ MERGED — ops / finance / cx / data_validation run in parallel
+    agent_outputs: Annotated[Dict[str, Any], merge_dicts]
+
+    # Per-node wall time (ms), merged across parallel branches
+    agent_latency_ms: Annotated[Dict[str, float], merge_dicts]
+
+    # Per-node wall / CPU time, state sizes, peak allocation (tracing on)
+    trace: Annotated[Dict[str, Dict], merge_dicts]
 
     final_decision: Dict
 
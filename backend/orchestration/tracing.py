@@ -0,0 +1,217 @@
+import os
+import threading
+import time
+import tracemalloc
+from typing import Dict
+
+from backend.utils.serialization import dumps
+
+# "off" | "on" (wall / CPU time, state sizes) | "memory" (on + tracemalloc peak)
+GRAPH_TRACE = os.getenv("GRAPH_TRACE", "on").lower()
+
+# Histogram bucket upper bounds (seconds) for node and run wall time
+TRACE_BUCKETS = [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0]
+
+# State keys written by the tracing layer itself (not counted in sizes)
+_OWN_KEYS = {"trace", "agent_latency_ms"}
+
+# tracemalloc's peak is process-wide: in mode "memory" only one node at a
+# time may run between reset_peak() and the read
+_MEMORY_LOCK = threading.Lock()
+
+
+def _payload_bytes(payload: Dict) -> int:
+    return len(dumps({k: v for k, v in payload.items() if k not in _OWN_KEYS}))
+
+
+class _Histogram:
+    def __init__(self):
+        self.buckets = [0] * len(TRACE_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        for i, bound in enumerate(TRACE_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+
+class GraphTracer:
+    """
+    Graph Tracer
+    ------------
+    Wraps graph nodes to measure each execution:
+
+    - wall time and CPU time (thread CPU, so parallel branches are
+      measured separately)
+    - serialized size of the state going in and of the update coming out
+    - peak traced allocation during the node (mode "memory"; the peak
+      counter is process-wide, so traced nodes run one at a time, which
+      serializes the parallel fan-out and concurrent runs in this mode;
+      wall time starts once the node holds the lock)
+
+    Each record lands in the run result under trace[node]; aggregates are
+    exported in Prometheus text format. Mode "off" leaves nodes unwrapped,
+    so there is no per-node cost at all. The mode is read when graphs are
+    compiled (once per process).
+    """
+
+    def __init__(self, mode: str = GRAPH_TRACE):
+        if mode not in ("off", "on", "memory"):
+            raise ValueError(f"Unknown GRAPH_TRACE mode: {mode}")
+
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._nodes: Dict[str, Dict] = {}
+        self._runs: Dict[str, _Histogram] = {}
+
+        if mode == "memory" and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    # --------------------------------------------------
+    # Measurement
+    # --------------------------------------------------
+    def wrap(self, name: str, node):
+        """
+        Node → node that also returns trace[name] with its measurements.
+        """
+
+        if not self.enabled:
+            return node
+
+        memory = self.mode == "memory"
+
+        def run(state):
+            if not memory:
+                return measure(state)
+            with _MEMORY_LOCK:
+                return measure(state)
+
+        def measure(state):
+            state_in = _payload_bytes(state)
+            if memory:
+                baseline = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+
+            wall_started = time.perf_counter()
+            cpu_started = time.thread_time()
+            try:
+                update = node(state) or {}
+            except Exception:
+                self._record_error(name)
+                raise
+            cpu = time.thread_time() - cpu_started
+            wall = time.perf_counter() - wall_started
+
+            record = {
+                "wall_ms": round(wall * 1000, 3),
+                "cpu_ms": round(cpu * 1000, 3),
+                "state_in_bytes": state_in,
+                "state_out_bytes": _payload_bytes(update),
+            }
+            if memory:
+                record["peak_alloc_bytes"] = max(0, tracemalloc.get_traced_memory()[1] - baseline)
+
+            self._record(name, wall, cpu, record)
+            update["trace"] = {name: record}
+            return update
+
+        return run
+
+    def _record(self, name: str, wall: float, cpu: float, record: Dict) -> None:
+        with self._lock:
+            entry = self._entry(name)
+            entry["wall"].observe(wall)
+            entry["cpu_seconds"] += cpu
+            entry["state_in_bytes"] += record["state_in_bytes"]
+            entry["state_out_bytes"] += record["state_out_bytes"]
+            entry["peak_alloc_bytes"] = max(entry["peak_alloc_bytes"], record.get("peak_alloc_bytes", 0))
+
+    def _record_error(self, name: str) -> None:
+        with self._lock:
+            self._entry(name)["errors"] += 1
+
+    def _entry(self, name: str) -> Dict:
+        # Caller holds self._lock
+        return self._nodes.setdefault(name, {
+            "wall": _Histogram(),
+            "cpu_seconds": 0.0,
+            "state_in_bytes": 0,
+            "state_out_bytes": 0,
+            "peak_alloc_bytes": 0,
+            "errors": 0,
+        })
+
+    def record_run(self, variant: str, elapsed_ms: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._runs.setdefault(variant, _Histogram()).observe(elapsed_ms / 1000)
+
+    # --------------------------------------------------
+    # Export
+    # --------------------------------------------------
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "nodes": {
+                    name: {
+                        "runs": e["wall"].count,
+                        "errors": e["errors"],
+                        "mean_wall_ms": round(e["wall"].total / e["wall"].count * 1000, 3) if e["wall"].count else None,
+                        "mean_cpu_ms": round(e["cpu_seconds"] / e["wall"].count * 1000, 3) if e["wall"].count else None,
+                        "peak_alloc_bytes": e["peak_alloc_bytes"],
+                    }
+                    for name, e in self._nodes.items()
+                },
+            }
+
+    def prometheus(self) -> str:
+        lines = []
+
+        def histogram(metric: str, help_text: str, label: str, series: Dict[str, _Histogram]):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for value, h in series.items():
+                cumulative = 0
+                for bound, n in zip(TRACE_BUCKETS, h.buckets):
+                    cumulative += n
+                    lines.append(f'{metric}_bucket{{{label}="{value}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{{label}="{value}",le="+Inf"}} {h.count}')
+                lines.append(f'{metric}_sum{{{label}="{value}"}} {h.total}')
+                lines.append(f'{metric}_count{{{label}="{value}"}} {h.count}')
+
+        def per_node(metric: str, kind: str, help_text: str, field: str):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, e in nodes.items():
+                lines.append(f'{metric}{{node="{name}"}} {e[field]}')
+
+        with self._lock:
+            nodes = self._nodes
+
+            histogram("agent_graph_run_seconds", "Graph run wall time by variant.", "variant", self._runs)
+            histogram(
+                "agent_node_wall_seconds", "Node wall time.", "node",
+                {name: e["wall"] for name, e in nodes.items()},
+            )
+            per_node("agent_node_cpu_seconds_total", "counter", "Node CPU time (executing thread).", "cpu_seconds")
+            per_node("agent_node_state_in_bytes_total", "counter", "Serialized state passed into the node.", "state_in_bytes")
+            per_node("agent_node_state_out_bytes_total", "counter", "Serialized update returned by the node.", "state_out_bytes")
+            per_node("agent_node_errors_total", "counter", "Node executions that raised.", "errors")
+            if self.mode == "memory":
+                per_node("agent_node_peak_alloc_bytes", "gauge", "Largest traced allocation peak during the node.", "peak_alloc_bytes")
+
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide tracer used by the graph builder and /metrics
+TRACER = GraphTracer()
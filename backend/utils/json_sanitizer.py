@@ -1,38 +0,0 @@
-import numpy as np
-import pandas as pd
-
-
-def json_safe(obj):
-    """
-    Recursively convert numpy / pandas types to native Python types
-    so FastAPI can serialize safely.
-    """
-
-    if isinstance(obj, dict):
-        return {str(k): json_safe(v) for k, v in obj.items()}
-
-    if isinstance(obj, list):
-        return [json_safe(v) for v in obj]
-
-    if isinstance(obj, tuple):
-        return [json_safe(v) for v in obj]
-
-    if isinstance(obj, (np.integer,)):
-        return int(obj)
-
-    if isinstance(obj, (np.floating,)):
-        return float(obj)
-
-    if isinstance(obj, (np.bool_,)):
-        return bool(obj)
-
-    if isinstance(obj, (np.ndarray,)):
-        return obj.tolist()
-
-    if isinstance(obj, pd.Timestamp):
-        return obj.isoformat()
-
-    if isinstance(obj, pd.DataFrame):
-        return json_safe(obj.to_dict(orient="records"))
-
-    return obj
@@ -1,28 +1,233 @@
+import json
+import os
+import time
+from datetime import date, datetime
+
 import numpy as np
 import pandas as pd
+from fastapi.responses import JSONResponse
+
+
+def _load_orjson():
+    try:
+        import orjson
+        return orjson
+    except ImportError:
+        return None
+
+
+_ORJSON = _load_orjson()
+
+# "orjson" (default when installed) or "json" to force the stdlib encoder
+SERIALIZATION_BACKEND = os.getenv("SERIALIZATION_BACKEND", "orjson" if _ORJSON else "json")
+
+_USE_ORJSON = _ORJSON is not None and SERIALIZATION_BACKEND == "orjson"
+
+_PASSTHROUGH = (str, int, float, bool, type(None))
+
 
+# --------------------------------------------------
+# Native conversion (column-level for frames)
+# --------------------------------------------------
+def _column_values(series: pd.Series) -> list:
+    if series.dtype.kind == "M":
+        return [None if pd.isna(v) else v.isoformat() for v in series]
+    # One bulk conversion per column: numpy → native Python scalars
+    return series.tolist()
 
-def make_json_safe(obj):
+
+def records(df: pd.DataFrame, columns: list | None = None) -> list:
     """
-    Recursively converts numpy / pandas objects to native Python types
+    df.to_dict(orient="records") with native Python values, converted
+    column by column instead of cell by cell.
     """
 
-    if isinstance(obj, dict):
-        return {k: make_json_safe(v) for k, v in obj.items()}
+    columns = list(df.columns) if columns is None else list(columns)
+    values = [_column_values(df[col]) for col in columns]
+    keys = [str(col) for col in columns]
 
-    if isinstance(obj, list):
-        return [make_json_safe(v) for v in obj]
+    return [dict(zip(keys, row)) for row in zip(*values)]
 
-    if isinstance(obj, (np.integer,)):
-        return int(obj)
 
-    if isinstance(obj, (np.floating,)):
-        return float(obj)
+def to_native(obj):
+    """
+    Converts numpy / pandas values nested in dicts and lists to native
+    Python types. Plain values return on an exact type check, arrays and
+    frames convert in bulk.
+    """
+
+    kind = type(obj)
+
+    if kind in _PASSTHROUGH:
+        return obj
 
-    if isinstance(obj, (np.ndarray,)):
+    if kind is dict:
+        return {k if type(k) is str else str(k): to_native(v) for k, v in obj.items()}
+
+    if kind is list or kind is tuple:
+        return [to_native(v) for v in obj]
+
+    if isinstance(obj, np.generic):
+        return obj.item()
+
+    if isinstance(obj, np.ndarray):
         return obj.tolist()
 
-    if isinstance(obj, (pd.Timestamp,)):
+    if isinstance(obj, pd.DataFrame):
+        return records(obj)
+
+    if isinstance(obj, pd.Series):
+        return _column_values(obj)
+
+    if isinstance(obj, (datetime, date)):
         return obj.isoformat()
 
+    if isinstance(obj, dict):
+        return {str(k): to_native(v) for k, v in obj.items()}
+
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return [to_native(v) for v in obj]
+
     return obj
+
+
+# --------------------------------------------------
+# Encoding
+# --------------------------------------------------
+def _default(obj):
+    # Called by the encoder only for values it cannot handle natively
+    if obj is pd.NA or obj is pd.NaT:
+        return None
+    if isinstance(obj, (np.generic, np.ndarray, pd.DataFrame, pd.Series, datetime, date)):
+        return to_native(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    return str(obj)
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """
+    JSON bytes for API responses and persisted results.
+
+    orjson (when installed) serializes numpy arrays / scalars natively and
+    writes NaN / inf as null; the stdlib fallback matches the previous
+    json.dumps(..., default=str) output.
+    """
+
+    if _USE_ORJSON:
+        option = _ORJSON.OPT_SERIALIZE_NUMPY | _ORJSON.OPT_NON_STR_KEYS
+        if indent:
+            option |= _ORJSON.OPT_INDENT_2
+        try:
+            return _ORJSON.dumps(obj, default=_default, option=option)
+        except TypeError:
+            # e.g. integers beyond 64 bits
+            pass
+
+    if indent:
+        return json.dumps(obj, default=_default, indent=2).encode("utf-8")
+    return json.dumps(obj, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data):
+    if _USE_ORJSON:
+        try:
+            return _ORJSON.loads(data)
+        except _ORJSON.JSONDecodeError:
+            # Payloads written by the stdlib may contain NaN / Infinity
+            pass
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with dumps(). Returning it from a route also
+    skips FastAPI's recursive jsonable_encoder pass.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+# --------------------------------------------------
+# Benchmark
+# --------------------------------------------------
+def _legacy_json_safe(obj):
+    # The recursive walk this module replaces (kept for comparison)
+    if isinstance(obj, dict):
+        return {str(k): _legacy_json_safe(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_legacy_json_safe(v) for v in obj]
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, pd.DataFrame):
+        return _legacy_json_safe(obj.to_dict(orient="records"))
+    return obj
+
+
+def _sample_run(customers: int) -> dict:
+    """
+    Run-shaped payload: risk state, engineered signals for `customers`
+    customers (numpy scalars, as produced by row access) and the frame
+    they came from.
+    """
+
+    from backend.intelligence.feature_store import FEATURE_STORE
+
+    top, risk_state = FEATURE_STORE.top(customers)
+
+    signals = [
+        {col: top[col].iloc[i] for col in top.columns}
+        for i in range(len(top))
+    ]
+
+    return {
+        "query": "Who needs attention today?",
+        "risk_state": risk_state,
+        "engineered_signals": signals,
+        "agent_outputs": {
+            "watchlist": top.head(customers // 2),
+            "scores": top["customer_risk_score"].to_numpy(),
+        },
+        "final_decision": {"overall_status": "STABLE", "attention_required": False},
+    }
+
+
+def benchmark(customers: int = 1000, repeats: int = 20) -> dict:
+    payload = _sample_run(customers)
+
+    def legacy():
+        return json.dumps(_legacy_json_safe(payload), separators=(",", ":"), default=str).encode("utf-8")
+
+    def current():
+        return dumps(payload)
+
+    def best_ms(fn):
+        best = float("inf")
+        for _ in range(repeats):
+            started = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - started)
+        return round(best * 1000, 3)
+
+    return {
+        "backend": "orjson" if _USE_ORJSON else "json",
+        "customers": customers,
+        "bytes": len(current()),
+        "legacy_ms": best_ms(legacy),
+        "dumps_ms": best_ms(current),
+        "records_ms": best_ms(lambda: records(payload["agent_outputs"]["watchlist"])),
+        "to_dict_ms": best_ms(lambda: _legacy_json_safe(payload["agent_outputs"]["watchlist"])),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps({str(n): benchmark(n) for n in (10, 1000, 10000)}, indent=2))
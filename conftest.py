@@ -0,0 +1,4 @@
+"""
+Repository root conftest: makes `backend` importable when pytest is run
+without `python -m` (pytest puts this directory on sys.path).
+"""
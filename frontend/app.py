@@ -1,3 +1,4 @@
+import json
 import streamlit as st
 import requests
 import pandas as pd
@@ -8,6 +9,16 @@ import plotly.express as px
 # ---------------------------
 BACKEND_ASK_URL = "https://agentic-ai-ops-backend.onrender.com/api/ask"
 BACKEND_DEBUG_URL = "https://agentic-ai-ops-backend.onrender.com/api/debug"
+BACKEND_STREAM_URL = "https://agentic-ai-ops-backend.onrender.com/api/ask/stream"
+
+# Only the slices the tabs render (skips risk_state, top_customers, feedback, ...)
+DASHBOARD_FIELDS = ",".join([
+    "final_decision",
+    "engineered_signals",
+    "agent_outputs.action_explainability.actions",
+    "agent_outputs.evaluation",
+    "agent_outputs.llm_explainer",
+])
 
 st.set_page_config(
     page_title="Agentic AI Ops Platform",
@@ -93,23 +104,75 @@ query = st.sidebar.text_input(
 run = st.sidebar.button("🚀 Run Analysis")
 
 # ---------------------------
-# RUN ANALYSIS (UNCHANGED LOGIC)
+# SSE HELPERS
+# ---------------------------
+def iter_sse(response):
+    event, data = None, []
+    for line in response.iter_lines(decode_unicode=True):
+        if not line:
+            if event:
+                yield event, json.loads("\n".join(data))
+            event, data = None, []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data.append(line[len("data:"):].strip())
+
+
+def describe_node(node, output):
+    if node == "feature_engineering":
+        return f"{len(output.get('engineered_signals', []))} customers prioritized"
+
+    agent = output.get("agent_outputs", {}).get(node, {})
+    if agent.get("severity"):
+        return f"severity **{agent['severity']}** — {agent.get('diagnosis', '')}"
+    if node == "evaluation" and agent:
+        return f"verdict **{agent.get('verdict')}**"
+    if node == "synthesis":
+        status = output.get("final_decision", {}).get("overall_status", "")
+        return f"overall status **{status.upper()}**"
+    return ""
+
+
+# ---------------------------
+# RUN ANALYSIS (STREAMED PER AGENT)
 # ---------------------------
 if run:
-    with st.spinner("Running multi-agent analysis..."):
-        response = requests.post(
-            BACKEND_ASK_URL,
-            json={"query": query}
+    meta = None
+
+    with st.status("Running multi-agent analysis...", expanded=True) as status:
+        response = requests.get(
+            BACKEND_STREAM_URL,
+            params={"query": query},
+            stream=True
         )
 
         if response.status_code != 200:
-            st.error("Backend execution failed")
+            status.update(label="Backend execution failed", state="error")
         else:
-            meta = response.json()
+            for event, data in iter_sse(response):
+                if event == "node":
+                    status.write(
+                        f"✅ **{data['node']}** · {data['elapsed_ms']:.0f} ms  "
+                        f"{describe_node(data['node'], data.get('output', {}))}"
+                    )
+                elif event == "done":
+                    meta = data
+                    status.update(
+                        label=f"Agents finished in {data['elapsed_ms']:.0f} ms",
+                        state="complete"
+                    )
+                elif event == "error":
+                    status.update(label="Backend execution failed", state="error")
+                    st.error(data.get("detail"))
+
+    if meta is not None:
+        with st.spinner("Loading full agent output..."):
             debug_file = meta.get("debug_file")
 
             debug_response = requests.get(
-                f"{BACKEND_DEBUG_URL}/{debug_file}"
+                f"{BACKEND_DEBUG_URL}/{debug_file}",
+                params={"fields": DASHBOARD_FIELDS}
             )
 
             if debug_response.status_code != 200:
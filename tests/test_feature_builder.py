@@ -0,0 +1,80 @@
+"""
+Feature Builder Tests
+---------------------
+The incremental builder against build_features() on the same data,
+after deltas that edit, remove and append customers.
+
+    python -m pytest -q tests
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.data.loader import load_customer_data
+from backend.intelligence.feature_builder import (
+    IncrementalFeatureBuilder,
+    FEATURE_COLUMNS,
+    RISK_COLUMNS,
+)
+from backend.intelligence.scoring_kernel import check_incremental_parity, score_features
+
+
+@pytest.fixture(scope="module")
+def raw() -> pd.DataFrame:
+    return load_customer_data()
+
+
+def test_features_match_build_features_layout(raw):
+    builder = IncrementalFeatureBuilder()
+    builder.build(raw)
+
+    features_df, risk_state = builder.features()
+    ref_df, ref_state = score_features(raw, RISK_COLUMNS, FEATURE_COLUMNS)
+
+    assert list(features_df.columns) == list(ref_df.columns)
+    assert (features_df.dtypes == ref_df.dtypes).all()
+    assert risk_state == ref_state
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_apply_delta_matches_build_features(raw, seed):
+    report = check_incremental_parity(raw, seed=seed)
+
+    assert report["delta"]["added"] == 5
+    assert report["delta"]["removed"] > 0
+    assert report["layout_identical"]
+    assert all(report["columns_identical"].values()), report["columns_identical"]
+    assert report["risk_state_identical"]
+    assert report["means_close"]
+    assert report["top_10_identical"]
+
+
+def test_update_rejects_large_delta_before_recomputing(raw):
+    builder = IncrementalFeatureBuilder()
+    builder.build(raw)
+
+    edited = raw.assign(avg_outage_hours=raw["avg_outage_hours"] + 1)
+
+    assert builder.update(edited, max_fraction=0.25) is None
+    assert builder.stats["deltas"] == 0
+    assert builder.stats["rows_recomputed"] == 0
+
+
+def test_update_recomputes_only_changed_rows(raw):
+    builder = IncrementalFeatureBuilder()
+    builder.build(raw)
+
+    edited = raw.copy()
+    edited.loc[edited.index[:3], "service_tickets"] += 1
+    # Not a kernel input: not part of the delta
+    edited.loc[edited.index[10], "tenure_months"] += 1
+
+    summary = builder.update(edited)
+
+    assert summary["changed"] == 3
+    assert builder.stats["rows_recomputed"] == 3
+
+    features_df, _ = builder.features()
+    ref_df, _ = score_features(edited, RISK_COLUMNS, FEATURE_COLUMNS)
+    assert np.array_equal(features_df["cx_stress"].to_numpy(), ref_df["cx_stress"].to_numpy())
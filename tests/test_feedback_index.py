@@ -0,0 +1,63 @@
+"""
+Feedback Index Tests
+--------------------
+Catching up from the JSONL log across rotations and damaged lines.
+
+    python -m pytest -q tests
+"""
+
+import json
+import os
+
+import pytest
+
+from backend.memory.feedback_index import FeedbackIndex
+from backend.memory.feedback_memory import FEEDBACK_WRITER
+
+
+def _line(n: int, pad: int = 0) -> str:
+    return json.dumps({
+        "timestamp": f"2026-10-01T00:00:{n:02d}",
+        "feedback": {"n": n, "final_decision": {"overall_status": "high", "summary": "x" * pad}},
+    }) + "\n"
+
+
+@pytest.fixture
+def log(tmp_path):
+    (tmp_path / FEEDBACK_WRITER.segment_dir.name).mkdir()
+    return tmp_path / "feedback_memory.jsonl"
+
+
+def _rotate(log, name: str) -> None:
+    os.replace(log, log.parent / FEEDBACK_WRITER.segment_dir.name / name)
+
+
+@pytest.mark.parametrize("pad_before, pad_after", [(0, 0), (3, 17)])
+def test_sync_reads_recreated_log_from_the_start(tmp_path, log, pad_before, pad_after):
+    index = FeedbackIndex(str(tmp_path / "index.sqlite3"))
+
+    log.write_text("".join(_line(n, pad_before) for n in range(5)))
+    assert index.sync(log) == 5
+
+    # Rotated, then the new active log grows past the old offset
+    _rotate(log, "feedback-2026-10-01-0.jsonl")
+    log.write_text("".join(_line(n, pad_after) for n in range(10, 17)))
+
+    assert index.sync(log) == 7
+    assert index.stats()["records"] == 12
+    assert index.stats()["offset_resets"] == 1
+
+
+def test_sync_skips_unreadable_lines(tmp_path, log):
+    index = FeedbackIndex(str(tmp_path / "index.sqlite3"))
+
+    log.write_text(_line(1) + "{not json\n" + _line(2))
+
+    assert index.sync(log) == 2
+    assert index.stats()["skipped_lines"] == 1
+
+    # The damaged line is behind the offset: not re-read
+    with open(log, "a", encoding="utf-8") as f:
+        f.write(_line(3))
+    assert index.sync(log) == 1
+    assert index.stats()["skipped_lines"] == 1
@@ -0,0 +1,63 @@
+"""
+Intent Rules Tests
+------------------
+Every labelled query in intent_rules_fixtures.json must route to its
+expected intent and entity (and any other field the fixture lists).
+The compiled-vs-substring microbenchmark stays a script:
+
+    python -m backend.agents.intent_rules
+"""
+
+import json
+
+import pytest
+
+from backend.agents.intent_rules import (
+    INTENT_ENGINE,
+    INTENT_FIXTURES_PATH,
+    IntentRuleEngine,
+    check_fixtures,
+)
+from backend.agents.query_understanding_agent import query_understanding_agent
+
+with open(INTENT_FIXTURES_PATH, "r", encoding="utf-8") as f:
+    FIXTURES = json.load(f)
+
+
+def test_fixture_file_labels_intent_and_entity():
+    assert FIXTURES
+    assert all("intent" in fixture and "entity" in fixture for fixture in FIXTURES)
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=[f["query"] for f in FIXTURES])
+def test_query_routes_to_expected_fields(fixture):
+    intent = query_understanding_agent({"query": fixture["query"]})["intent"]
+
+    expected = {field: value for field, value in fixture.items() if field != "query"}
+    assert {field: intent.get(field) for field in expected} == expected
+
+
+def test_check_fixtures_reports_no_failures():
+    report = check_fixtures()
+
+    assert report["passed"] == report["fixtures"] == len(FIXTURES)
+    assert report["failures"] == []
+
+
+def test_check_fixtures_reports_a_wrong_rule():
+    # Drop the prioritization terms: its fixtures must now fail
+    config = {
+        "version": "test",
+        "fields": {
+            name: {**spec, "rules": [r for r in spec.get("rules", []) if r["label"] != "prioritization"]}
+            for name, spec in INTENT_ENGINE.fields.items()
+        },
+    }
+
+    report = check_fixtures(IntentRuleEngine(config))
+
+    assert report["failures"]
+    assert all(
+        failure["fields"]["intent"]["expected"] == "prioritization"
+        for failure in report["failures"] if "intent" in failure["fields"]
+    )
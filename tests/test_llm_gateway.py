@@ -0,0 +1,321 @@
+"""
+LLM Gateway Tests
+-----------------
+Drive the gateway against the local fake provider (no network):
+retries with backoff, the overall deadline, the circuit breaker, the
+concurrency cap and the explainer's fallback summary.
+
+    python -m pytest -q tests
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.agents import llm_explainer_agent
+from backend.llm import fake_provider, gateway
+from backend.llm.gateway import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LLMGateway,
+    LLMUnavailableError,
+)
+
+MESSAGES = [{"role": "user", "content": "Summarize the risk."}]
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """
+    Factory: starts a fake provider with the given behaviour and points
+    the Groq client at it. Servers are shut down after the test.
+    """
+
+    servers = []
+
+    def start(**behaviour):
+        server = fake_provider.serve(**behaviour)
+        servers.append(server)
+        monkeypatch.setenv("GROQ_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}")
+        monkeypatch.setenv("GROQ_API_KEY", "fake")
+        return server.RequestHandlerClass
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def fixed_backoff(monkeypatch):
+    """
+    Short, jitter-free backoff: each sleep is exactly base * 2 ** attempt.
+    """
+
+    monkeypatch.setattr(gateway, "LLM_BACKOFF_BASE_SECONDS", 0.05)
+    monkeypatch.setattr(gateway.random, "uniform", lambda low, high: high)
+
+
+def _gateway(**overrides) -> LLMGateway:
+    params = {"timeout_seconds": 5, "deadline_seconds": 10, "max_retries": 3}
+    params.update(overrides)
+    return LLMGateway(**params)
+
+
+# --------------------------------------------------
+# Retries
+# --------------------------------------------------
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_retries_transient_status_with_backoff(provider, fixed_backoff, status):
+    handler = provider(fail_first=2, fail_status=status)
+    llm = _gateway()
+
+    started = time.monotonic()
+    text = llm.complete(MESSAGES, model="fake")
+    elapsed = time.monotonic() - started
+
+    assert text.startswith("Fake executive summary")
+    assert handler.requests == 3
+    assert llm.stats()["retries"] == 2
+    assert llm.stats()["succeeded"] == 1
+    # Backoff 0.05 then 0.1 before the third attempt
+    assert elapsed >= 0.15
+
+
+def test_gives_up_after_max_retries(provider, fixed_backoff):
+    handler = provider(fail_rate=1.0, fail_status=503)
+    llm = _gateway(max_retries=2)
+
+    with pytest.raises(LLMUnavailableError):
+        llm.complete(MESSAGES, model="fake")
+
+    assert handler.requests == 3
+    assert llm.stats()["failed"] == 1
+
+
+def test_client_errors_are_not_retried(provider, fixed_backoff):
+    handler = provider(fail_rate=1.0, fail_status=400)
+    llm = _gateway()
+
+    with pytest.raises(LLMUnavailableError):
+        llm.complete(MESSAGES, model="fake")
+
+    assert handler.requests == 1
+    assert llm.stats()["retries"] == 0
+
+
+# --------------------------------------------------
+# Deadline
+# --------------------------------------------------
+def test_deadline_bounds_a_slow_provider(provider, fixed_backoff):
+    provider(latency=1.0)
+    llm = _gateway(timeout_seconds=5, deadline_seconds=0.3, max_retries=5)
+
+    started = time.monotonic()
+    with pytest.raises(LLMUnavailableError, match="deadline exceeded"):
+        llm.complete(MESSAGES, model="fake")
+
+    assert time.monotonic() - started < 0.9
+
+
+def test_per_attempt_timeout_is_retried_within_deadline(provider, fixed_backoff):
+    handler = provider(latency=0.5)
+    llm = _gateway(timeout_seconds=0.1, deadline_seconds=0.6, max_retries=10)
+
+    started = time.monotonic()
+    with pytest.raises(LLMUnavailableError):
+        llm.complete(MESSAGES, model="fake")
+
+    assert handler.requests >= 2
+    assert time.monotonic() - started < 1.0
+
+
+def test_deadline_covers_waiting_for_a_concurrency_slot(provider):
+    provider(latency=0.25)
+    llm = _gateway(deadline_seconds=0.3, max_concurrency=1)
+
+    def call():
+        started = time.monotonic()
+        try:
+            llm.complete(MESSAGES, model="fake")
+            outcome = "ok"
+        except LLMUnavailableError:
+            outcome = "unavailable"
+        return outcome, time.monotonic() - started
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(pool.map(lambda _: call(), range(6)))
+
+    # One call gets the slot; the rest give up at their own deadline
+    # (the next in line may get the slot with too little time left)
+    assert sorted(outcome for outcome, _ in results) == ["ok"] + ["unavailable"] * 5
+    assert max(elapsed for _, elapsed in results) < 0.45
+    assert llm.stats()["queue_timeouts"] >= 1
+
+
+# --------------------------------------------------
+# Circuit breaker
+# --------------------------------------------------
+def test_client_errors_do_not_trip_the_breaker(provider):
+    handler = provider(fail_rate=1.0, fail_status=400)
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+    llm = _gateway(max_retries=0, breaker=breaker)
+
+    for _ in range(3):
+        with pytest.raises(LLMUnavailableError):
+            llm.complete(MESSAGES, model="fake")
+
+    assert breaker.state == "closed"
+    assert handler.requests == 3
+
+
+def test_client_error_frees_the_half_open_probe(provider):
+    provider(fail_rate=1.0, fail_status=400)
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+    llm = _gateway(max_retries=0, breaker=breaker)
+
+    # Each probe gets a 4xx; the next call may probe again
+    for _ in range(2):
+        with pytest.raises(LLMUnavailableError) as error:
+            llm.complete(MESSAGES, model="fake")
+        assert not isinstance(error.value, CircuitOpenError)
+
+    assert breaker.state == "half_open"
+
+
+def test_breaker_opens_and_short_circuits(provider):
+    handler = provider(fail_rate=1.0, fail_status=503)
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    llm = _gateway(max_retries=0, breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(LLMUnavailableError):
+            llm.complete(MESSAGES, model="fake")
+
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        llm.complete(MESSAGES, model="fake")
+
+    assert handler.requests == 2
+    assert llm.stats()["short_circuited"] == 1
+
+
+def test_breaker_half_open_admits_one_probe_then_closes(provider):
+    handler = provider(fail_first=2, fail_status=503, latency=0.3)
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.2)
+    llm = _gateway(max_retries=0, breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(LLMUnavailableError):
+            llm.complete(MESSAGES, model="fake")
+
+    assert breaker.state == "open"
+    time.sleep(0.25)
+
+    def call():
+        try:
+            return llm.complete(MESSAGES, model="fake")
+        except CircuitOpenError as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lambda _: call(), range(2)))
+
+    # One probe reached the provider; the other call was rejected
+    assert sum(isinstance(r, CircuitOpenError) for r in results) == 1
+    assert sum(isinstance(r, str) for r in results) == 1
+    assert handler.requests == 3
+    assert breaker.state == "closed"
+
+
+def test_breaker_reopens_when_probe_fails(provider):
+    handler = provider(fail_rate=1.0, fail_status=503)
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.2)
+    llm = _gateway(max_retries=0, breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(LLMUnavailableError):
+            llm.complete(MESSAGES, model="fake")
+
+    time.sleep(0.25)
+
+    with pytest.raises(LLMUnavailableError) as probe:
+        llm.complete(MESSAGES, model="fake")
+
+    assert not isinstance(probe.value, CircuitOpenError)
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        llm.complete(MESSAGES, model="fake")
+
+    assert handler.requests == 3
+
+
+# --------------------------------------------------
+# Concurrency cap
+# --------------------------------------------------
+def test_concurrency_cap_holds_under_parallel_calls(provider):
+    handler = provider(latency=0.2)
+    llm = _gateway(max_concurrency=2)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: llm.complete(MESSAGES, model="fake"), range(8)))
+    elapsed = time.monotonic() - started
+
+    assert len(results) == 8
+    assert handler.requests == 8
+    assert handler.max_in_flight == 2
+    # 8 calls, 2 at a time, 0.2s each
+    assert elapsed >= 0.8
+
+
+# --------------------------------------------------
+# Explainer fallback
+# --------------------------------------------------
+def _explainer_state() -> dict:
+    return {
+        "bypass_llm_cache": True,
+        "top_customers": [
+            {"customer_id": "C001", "customer_risk_score": 0.91, "region": "North"},
+            {"customer_id": "C002", "customer_risk_score": 0.84, "region": "South"},
+        ],
+        "final_decision": {
+            "overall_status": "high",
+            "confidence": 0.8,
+            "summary": "Outage exposure is elevated.",
+            "primary_driver": ["operations"],
+        },
+    }
+
+
+def test_explainer_falls_back_when_provider_fails(provider, monkeypatch):
+    handler = provider(fail_rate=1.0, fail_status=503)
+    monkeypatch.setattr(llm_explainer_agent, "LLM_GATEWAY", _gateway(max_retries=0))
+
+    state = _explainer_state()
+    output = llm_explainer_agent.llm_explainer_agent_node(state)["llm_explainer"]
+
+    assert output["source"] == "fallback"
+    assert output["fallback_reason"]
+    assert output["executive_summary"] == llm_explainer_agent._fallback_summary(
+        state["top_customers"], state["final_decision"]
+    )
+    assert handler.requests == 1
+
+
+def test_explainer_falls_back_without_calling_an_open_circuit(provider, monkeypatch):
+    handler = provider()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+    breaker.record_failure()
+    monkeypatch.setattr(llm_explainer_agent, "LLM_GATEWAY", _gateway(breaker=breaker))
+
+    output = llm_explainer_agent.llm_explainer_agent_node(_explainer_state())["llm_explainer"]
+
+    assert output["source"] == "fallback"
+    assert "circuit is open" in output["fallback_reason"]
+    assert handler.requests == 0
@@ -0,0 +1,45 @@
+"""
+Risk Representation Tests
+-------------------------
+Streamed risk state: exact while small, otherwise flagged approximate
+with its rank error bound, and within that bound of the exact state.
+
+    python -m pytest -q tests
+"""
+
+import numpy as np
+import pandas as pd
+
+from backend.intelligence.risk_representation import RiskStateAccumulator, build_risk_state
+
+
+def test_small_input_is_exact():
+    df = pd.DataFrame({"x": np.arange(100, dtype=float)})
+    accumulator = RiskStateAccumulator(["x"])
+    accumulator.update(df)
+
+    state = accumulator.result()["x"]
+
+    assert state["approximate"] is False
+    assert state["quantile_rank_error"] == 0.0
+    assert state["p75"] == build_risk_state(df, ["x"])["x"]["p75"]
+
+
+def test_streamed_quantiles_report_their_bound():
+    values = np.random.default_rng(0).gamma(2.0, 3.0, 50_000)
+    accumulator = RiskStateAccumulator(["x"], epsilon=0.01)
+    for chunk in np.array_split(values, 10):
+        accumulator.update(pd.DataFrame({"x": chunk}))
+
+    state = accumulator.result()["x"]
+    bound = state["quantile_rank_error"]
+
+    assert state["approximate"] is True
+    assert bound == accumulator.error_bound()["x"]
+    assert 0 < bound <= 0.01
+
+    # Reported percentiles sit within the bound of their true rank
+    # (with slack for the probabilistic guarantee)
+    for q in (0.75, 0.90):
+        rank = np.mean(values <= state[f"p{int(q * 100)}"])
+        assert abs(rank - q) <= 2 * bound